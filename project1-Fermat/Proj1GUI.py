@@ -12,16 +12,16 @@ if PYQT_VER == 'PYQT5':
 	from PyQt5.QtWidgets import QApplication, QWidget
 	from PyQt5.QtGui import QIcon
 	from PyQt5.QtWidgets import QHBoxLayout, QVBoxLayout
-	from PyQt5.QtWidgets import QLabel, QPushButton, QLineEdit
+	from PyQt5.QtWidgets import QLabel, QPushButton, QLineEdit, QCheckBox
 elif PYQT_VER == 'PYQT4':
 	from PyQt4.QtGui import QApplication, QWidget
 	from PyQt4.QtGui import QHBoxLayout, QVBoxLayout
-	from PyQt4.QtGui import QIcon, QLabel, QPushButton, QLineEdit
+	from PyQt4.QtGui import QIcon, QLabel, QPushButton, QLineEdit, QCheckBox
 elif PYQT_VER == 'PYQT6':
 	from PyQt6.QtWidgets import QApplication, QWidget
 	from PyQt6.QtGui import QIcon
 	from PyQt6.QtWidgets import QHBoxLayout, QVBoxLayout
-	from PyQt6.QtWidgets import QLabel, QPushButton, QLineEdit
+	from PyQt6.QtWidgets import QLabel, QPushButton, QLineEdit, QCheckBox
 else:
 	raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
 
@@ -48,6 +48,7 @@ class Proj1GUI( QWidget ):
 		self.input_n = QLineEdit('312')
 		self.input_k = QLineEdit('10')
 		self.test    = QPushButton('Test Primality')
+		self.deterministic = QCheckBox('Deterministic')
 		self.outputF  = QLabel('<i>N is the number to test, K is how many random trials</i>')
 		self.outputF.setMinimumSize(500,0)
 		self.outputMR = QLabel('')
@@ -67,6 +68,7 @@ class Proj1GUI( QWidget ):
 
         # Test
 		h = QHBoxLayout()
+		h.addWidget( self.deterministic )
 		h.addStretch(1)
 		h.addWidget( self.test )
 		vbox.addLayout(h)
@@ -100,7 +102,8 @@ class Proj1GUI( QWidget ):
 
 			# This is the call to the pass-through function that gets your results, from
 			# both the Fermat and Miller-Rabin tests you will implement
-			fermat,mr = prime_test(n,k)
+			mode = 'deterministic' if self.deterministic.isChecked() else 'random'
+			fermat,mr = prime_test(n,k,mode)
 
 			# Output results from Fermat and compute the appropriate error bound, if necessary
 			if fermat == 'prime':
@@ -111,8 +114,11 @@ class Proj1GUI( QWidget ):
 
 			# Output results from Miller-Rabin and compute the appropriate error bound, if necessary
 			if mr == 'prime':
-				prob = mprobability(k)
-				self.outputMR.setText( '<i>MR Result:</i> {:d} <b>is prime</b> with probability {:5.15f}'.format(n,prob) )
+				prob = mprobability(k,n,mode)
+				if prob is None: # Baillie-PSW verdict, there is no probability to show
+					self.outputMR.setText( '<i>MR Result:</i> {:d} <b>is prime</b> ({})'.format(n,BPSW_LABEL) )
+				else:
+					self.outputMR.setText( '<i>MR Result:</i> {:d} <b>is prime</b> with probability {:5.15f}'.format(n,prob) )
 			else: # Should be 'composite'
 				self.outputMR.setText('<i>MR Result:</i> {:d} is <b>not prime</b>'.format(n))
 
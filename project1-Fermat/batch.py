@@ -0,0 +1,36 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
+from fermat import prime_test
+
+# Batch front end for prime_test. Candidates are cut into chunks so each worker
+# process gets enough numbers to amortize the pickling round trip, and
+# executor.map hands the chunks back in the order they went out.
+
+DEFAULT_CHUNKSIZE = 256
+
+def _chunks(iterable, chunksize):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def test_chunk(chunk, k, mode):
+    # One worker's share: (fermat, miller_rabin) pairs for a list of candidates
+    return [prime_test(N, k, mode) for N in chunk]
+
+def prime_test_many(iterable, k, workers=None, chunksize=DEFAULT_CHUNKSIZE, mode='random'):
+    # Returns one (fermat, miller_rabin) pair per candidate, in input order
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return [prime_test(N, k, mode) for N in iterable]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunkResults in executor.map(test_chunk, _chunks(iterable, chunksize), repeat(k), repeat(mode)):
+            results.extend(chunkResults)
+    return results
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+# Headless benchmark suite for the primality code. Sweeps candidate bit
+# lengths and k values over a prime/composite mix, timing fermat, miller_rabin
+# and mod_exp one call at a time. Results are written as JSON, and when a
+# baseline file is given any cell whose median latency grew by more than the
+# tolerance is reported and the script exits with status 1.
+#
+#   python benchmark.py --output results.json
+#   python benchmark.py --save-baseline                 # refresh benchmark_baseline.json
+#   python benchmark.py --baseline benchmark_baseline.json --tolerance 0.5
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import modexp
+from fermat import fermat, miller_rabin, mod_exp
+from prime_generator import random_primes
+
+BIT_LENGTHS = [24, 32, 64, 128, 256, 512, 1024, 2048, 4096] # from 24 bits every candidate is past PROVEN_PRIME_LIMIT, below it the prefilter answers
+K_VALUES = [1, 8]
+CANDIDATES_PER_KIND = 4 # primes and composites per bit length
+GENERATION_TRIALS = 4 # Miller-Rabin trials when building the prime half of the workload
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+DEFAULT_TOLERANCE = 0.5
+
+
+def repetitionsFor(bits):
+	# enough calls for a stable median at small sizes, without letting 4096 bits run for minutes
+	return max(2, 4096 // bits)
+
+def buildWorkload(bits, rng):
+	# Half primes, half semiprimes. Both halves of a semiprime are at least 12 bits, so past the prefilter's
+	# trial divisors, and at 24 bits or more the product is past PROVEN_PRIME_LIMIT: every candidate reaches the exponentiation
+	primeSource = random_primes(bits, GENERATION_TRIALS, rng=rng)
+	primes = [next(primeSource) for _ in range(CANDIDATES_PER_KIND)]
+	composites = []
+	halfSource = random_primes(max(bits // 2, 2), GENERATION_TRIALS, rng=rng)
+	while len(composites) < CANDIDATES_PER_KIND:
+		composite = next(halfSource) * next(halfSource)
+		if composite.bit_length() == bits:
+			composites.append(composite)
+	return primes, composites
+
+def percentile(sortedValues, fraction):
+	index = min(len(sortedValues) - 1, int(round(fraction * (len(sortedValues) - 1))))
+	return sortedValues[index]
+
+def measure(call, arguments):
+	latencies = []
+	for args in arguments:
+		start = time.perf_counter_ns()
+		call(*args)
+		latencies.append(time.perf_counter_ns() - start)
+	latencies.sort()
+	total = sum(latencies)
+
+	# Allocations are measured in a separate pass, tracemalloc slows every call it watches
+	tracemalloc.start()
+	peaks = []
+	for args in arguments[:CANDIDATES_PER_KIND]:
+		tracemalloc.reset_peak()
+		before = tracemalloc.get_traced_memory()[0]
+		call(*args)
+		peaks.append(tracemalloc.get_traced_memory()[1] - before)
+	tracemalloc.stop()
+
+	return {
+		'calls': len(latencies),
+		'opsPerSec': len(latencies) / (total / 1e9) if total else float('inf'),
+		'p50Us': percentile(latencies, 0.50) / 1000,
+		'p99Us': percentile(latencies, 0.99) / 1000,
+		'peakAllocBytes': max(peaks),
+	}
+
+def runSuite(bitLengths, kValues, seed):
+	rng = random.Random(seed)
+	results = []
+	for bits in bitLengths:
+		primes, composites = buildWorkload(bits, rng)
+		repetitions = repetitionsFor(bits)
+		mixed = [candidate for pair in zip(primes, composites) for candidate in pair] * repetitions
+
+		bases = [rng.randint(2, candidate - 2) for candidate in mixed]
+		cell = measure(mod_exp, [(base, candidate - 1, candidate) for base, candidate in zip(bases, mixed)])
+		results.append(dict(function='mod_exp', bits=bits, k=None, **cell))
+
+		for k in kValues:
+			for name, function in (('fermat', fermat), ('miller_rabin', miller_rabin)):
+				cell = measure(function, [(candidate, k) for candidate in mixed])
+				results.append(dict(function=name, bits=bits, k=k, **cell))
+		print('{:>5} bits done'.format(bits), file=sys.stderr)
+	return results
+
+def cellKey(cell):
+	return '{}/{}/{}'.format(cell['function'], cell['bits'], cell['k'])
+
+def compare(results, baseline, tolerance):
+	# Slowdowns past the tolerance, as (cell, baseline p50, current p50)
+	baselineCells = {cellKey(cell): cell for cell in baseline['results']}
+	regressions = []
+	for cell in results:
+		reference = baselineCells.get(cellKey(cell))
+		if reference and cell['p50Us'] > reference['p50Us'] * (1 + tolerance):
+			regressions.append((cellKey(cell), reference['p50Us'], cell['p50Us']))
+	return regressions
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Primality benchmark sweep')
+	parser.add_argument('--bits', type=int, nargs='+', default=BIT_LENGTHS)
+	parser.add_argument('--k', type=int, nargs='+', default=K_VALUES)
+	parser.add_argument('--seed', type=int, default=312)
+	parser.add_argument('--output', help='write the JSON report here instead of stdout')
+	parser.add_argument('--baseline', help='fail if any cell is slower than this stored report')
+	parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='allowed p50 slowdown, 0.5 = 50%%')
+	parser.add_argument('--save-baseline', action='store_true', help='store this run as ' + os.path.basename(DEFAULT_BASELINE))
+	args = parser.parse_args(argv)
+
+	report = {
+		'python': platform.python_version(),
+		'machine': platform.machine(),
+		'modExpBackend': modexp.get_backend(),
+		'seed': args.seed,
+		'results': runSuite(args.bits, args.k, args.seed),
+	}
+	text = json.dumps(report, indent=1)
+	if args.output:
+		with open(args.output, 'w') as output:
+			output.write(text + '\n')
+	else:
+		print(text)
+	if args.save_baseline:
+		with open(DEFAULT_BASELINE, 'w') as output:
+			output.write(text + '\n')
+
+	if args.baseline:
+		with open(args.baseline) as stored:
+			regressions = compare(report['results'], json.load(stored), args.tolerance)
+		for key, before, after in regressions:
+			print('REGRESSION {}: p50 {:.1f} us -> {:.1f} us'.format(key, before, after), file=sys.stderr)
+		if regressions:
+			return 1
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
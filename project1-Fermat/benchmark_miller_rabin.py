@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# Compares the cost of one Miller-Rabin witness using the old approach (a fresh
+# mod_exp for every halving of N-1) against the s/d decomposition (one mod_exp
+# of a^d followed by at most s squarings).
+
+import random
+import sys
+import time
+
+from fermat import decompose, isEven, millerRabinWitness, miller_rabin, mod_exp
+
+BIT_LENGTHS = [512, 1024, 2048]
+WITNESSES = 50
+
+
+def halvingWitness(expBase, exponent, testNumber):
+	# The original millerRabinTest, kept here only as the reference point
+	while True:
+		modExpResult = mod_exp(expBase, exponent, testNumber)
+		if modExpResult == testNumber-1 or (not isEven(exponent)):
+			return 'prime'
+		elif modExpResult != 1:
+			return 'composite'
+		exponent //= 2
+
+def randomPrime(bits):
+	while True:
+		candidate = random.getrandbits(bits) | (1 << (bits - 1)) | 1
+		if miller_rabin(candidate, 20) == 'prime':
+			return candidate
+
+def timeWitnesses(function, bases, *args):
+	start = time.perf_counter()
+	for expBase in bases:
+		function(expBase, *args)
+	return (time.perf_counter() - start) / len(bases)
+
+def main():
+	random.seed(int(sys.argv[1]) if len(sys.argv) > 1 else 312)
+	print('{:>6} {:>4} {:>14} {:>14} {:>8}'.format('bits', 's', 'halving (ms)', 's/d (ms)', 'speedup'))
+	for bits in BIT_LENGTHS:
+		testNumber = randomPrime(bits)
+		s, d = decompose(testNumber)
+		bases = [random.randint(2, testNumber-2) for _ in range(WITNESSES)]
+		old = timeWitnesses(halvingWitness, bases, testNumber-1, testNumber)
+		new = timeWitnesses(millerRabinWitness, bases, s, d, testNumber)
+		print('{:>6} {:>4} {:>14.3f} {:>14.3f} {:>7.2f}x'.format(bits, s, old * 1000, new * 1000, old / new))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+# Times prime_generator.random_primes against naive rejection sampling (a fresh
+# random odd number per attempt, each one run through miller_rabin).
+
+import random
+import sys
+import time
+
+from fermat import miller_rabin
+from prime_generator import DEFAULT_TRIALS, random_primes
+
+BIT_LENGTHS = [1024, 2048]
+PRIMES_PER_SIZE = {1024: 20, 2048: 8}
+
+
+def naivePrimes(bits, k, rng):
+	while True:
+		candidate = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+		if miller_rabin(candidate, k) == 'prime':
+			yield candidate
+
+def timeGenerator(generator, count):
+	start = time.perf_counter()
+	for _ in range(count):
+		next(generator)
+	return (time.perf_counter() - start) / count
+
+def main():
+	seed = int(sys.argv[1]) if len(sys.argv) > 1 else 312
+	print('{:>6} {:>16} {:>16} {:>8}'.format('bits', 'naive (s/prime)', 'sieved (s/prime)', 'speedup'))
+	for bits in BIT_LENGTHS:
+		naive = timeGenerator(naivePrimes(bits, DEFAULT_TRIALS, random.Random(seed)), PRIMES_PER_SIZE[bits])
+		sieved = timeGenerator(random_primes(bits, rng=random.Random(seed)), PRIMES_PER_SIZE[bits])
+		print('{:>6} {:>16.3f} {:>16.3f} {:>7.2f}x'.format(bits, naive, sieved, naive / sieved))
+
+
+if __name__ == '__main__':
+	main()
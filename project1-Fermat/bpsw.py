@@ -0,0 +1,94 @@
+import math
+
+# Deterministic primality support. Below DETERMINISTIC_LIMIT a fixed set of
+# Miller-Rabin bases is known to give the right answer for every N, so the
+# random trials can be skipped. Above it, Baillie-PSW (a base 2 strong probable
+# prime test plus a strong Lucas test) is used; no counterexample is known.
+
+# (exclusive upper bound on N, bases that are sufficient below it)
+WITNESS_SETS = [
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (2**64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3317044064679887385961981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+]
+
+DETERMINISTIC_LIMIT = WITNESS_SETS[-1][0]
+
+def deterministic_bases(testNumber):
+    # None means N is past the table and needs Baillie-PSW instead
+    for limit, bases in WITNESS_SETS:
+        if testNumber < limit:
+            return bases
+    return None
+
+def jacobi(a, n): # n odd and positive, O(log n) steps of quadratic reciprocity
+    a %= n
+    result = 1
+    while a:
+        while not a & 1:
+            a >>= 1
+            if n & 7 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a & 3 == 3 and n & 3 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def selfridge_parameters(testNumber):
+    # Selfridge's method A: first D in 5, -7, 9, -11, ... with (D/N) = -1, then P = 1 and Q = (1-D)/4
+    D = 5
+    while True:
+        symbol = jacobi(D, testNumber)
+        if symbol == -1:
+            return D, 1, (1 - D) // 4
+        if symbol == 0 and abs(D) != testNumber:
+            return None # D shares a factor with N
+        D = -D - 2 if D > 0 else -D + 2
+
+def strong_lucas_test(testNumber):
+    if testNumber == 2:
+        return 'prime'
+    if testNumber < 2 or not testNumber & 1 or math.isqrt(testNumber)**2 == testNumber: # squares never find a D with (D/N) = -1
+        return 'composite'
+    parameters = selfridge_parameters(testNumber)
+    if parameters is None:
+        return 'composite'
+    D, P, Q = parameters
+
+    d = testNumber + 1
+    s = 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+
+    def halve(value): # value / 2 mod N, N is odd
+        if value & 1:
+            value += testNumber
+        return (value >> 1) % testNumber
+
+    # Binary Lucas chain for U_d and V_d, Q^k is carried along for the doubling step
+    U, V, Qk = 1, P, Q % testNumber
+    for bit in bin(d)[3:]:
+        U, V = (U * V) % testNumber, (V * V - 2 * Qk) % testNumber
+        Qk = (Qk * Qk) % testNumber
+        if bit == '1':
+            U, V = halve(P * U + V), halve(D * U + P * V)
+            Qk = (Qk * Q) % testNumber
+
+    if U == 0 or V == 0:
+        return 'prime'
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % testNumber
+        Qk = (Qk * Qk) % testNumber
+        if V == 0:
+            return 'prime'
+    return 'composite'
@@ -0,0 +1,100 @@
+import struct
+from collections import OrderedDict
+
+from fermat import prime_test
+
+# Bounded LRU cache in front of prime_test, keyed on (N, mode). Answers
+# remember the k they were computed with and are only reused for a request that
+# asks for the same number of trials or fewer; that holds in deterministic mode
+# too, whose Fermat half still runs k random trials. Snapshots are a
+# compact binary file so a restarted process can start warm.
+
+DEFAULT_MAXSIZE = 1 << 16
+MODES = ('random', 'deterministic')
+
+_MAGIC = b'PRC1'
+_ENTRY = struct.Struct('<BBIH') # mode, verdict bits, k, byte length of N
+
+class PrimalityCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self._entries = OrderedDict() # (N, mode) -> (k, (fermat, miller_rabin)), oldest first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, N, k, mode='random'):
+        entry = self._entries.get((N, mode))
+        if entry is None or entry[0] < k:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((N, mode))
+        self.hits += 1
+        return entry[1]
+
+    def put(self, N, k, mode, result):
+        key = (N, mode)
+        self._entries[key] = (k, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def prime_test(self, N, k, mode='random'):
+        result = self.get(N, k, mode)
+        if result is None:
+            result = prime_test(N, k, mode)
+            self.put(N, k, mode, result)
+        return result
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+    def save(self, path):
+        # Entries are written oldest first so load() rebuilds the same LRU order
+        with open(path, 'wb') as snapshot:
+            snapshot.write(_MAGIC)
+            for (N, mode), (k, (fermatResult, mrResult)) in self._entries.items():
+                if N < 0:
+                    continue # never produced by prime_test on a real candidate, not worth a sign bit
+                verdict = (fermatResult == 'prime') | (mrResult == 'prime') << 1
+                payload = N.to_bytes((N.bit_length() + 7) // 8, 'little')
+                snapshot.write(_ENTRY.pack(MODES.index(mode), verdict, min(k, 0xFFFFFFFF), len(payload)))
+                snapshot.write(payload)
+
+    def load(self, path):
+        with open(path, 'rb') as snapshot:
+            data = snapshot.read()
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError('{} is not a primality cache snapshot'.format(path))
+        offset = len(_MAGIC)
+        while offset < len(data):
+            modeIndex, verdict, k, length = _ENTRY.unpack_from(data, offset)
+            offset += _ENTRY.size
+            N = int.from_bytes(data[offset:offset + length], 'little')
+            offset += length
+            result = ('prime' if verdict & 1 else 'composite', 'prime' if verdict & 2 else 'composite')
+            self.put(N, k, MODES[modeIndex], result)
+
+default_cache = PrimalityCache()
+
+def cached_prime_test(N, k, mode='random'):
+    return default_cache.prime_test(N, k, mode)
@@ -0,0 +1,199 @@
+import math
+import random
+import time
+
+from fermat import deterministic_miller_rabin, mod_exp
+from sieve import base_primes
+
+# Integer factorization for numbers prime_test calls composite. Stages run in
+# order of cost and each cofactor only moves on to the next stage when the
+# cheaper one gives up:
+#
+#   trial  division by every prime in TRIAL_PRIMES
+#   rho    Pollard's rho, Brent's cycle finding, gcds batched RHO_BATCH at a time
+#   ecm    Lenstra's elliptic curve method, stage 1 only, Montgomery curves
+#
+# Cofactors are proven prime with deterministic_miller_rabin, and the curve
+# setup powers go through the same mod_exp engine. Every stage records how long it ran and which
+# factors it found.
+
+TRIAL_LIMIT = 1 << 16
+TRIAL_PRIMES = base_primes(TRIAL_LIMIT)
+RHO_BATCH = 128
+RHO_MAX_ITERATIONS = 1 << 15 # past this ECM is the cheaper way to find a 40-bit factor
+# (B1, curves) per ECM round, loosely after GMP-ECM's table for 15 to 30 digit factors
+ECM_SCHEDULE = [(2000, 25), (11000, 90), (50000, 300), (250000, 700)]
+
+class FactorizationResult:
+    def __init__(self, number):
+        self.number = number
+        self.factors = [] # prime factors with multiplicity, sorted once factorize() finishes
+        self.stages = {name: {'seconds': 0.0, 'found': []} for name in ('trial', 'rho', 'ecm')}
+        self.unfactored = [] # composite cofactors every stage gave up on
+
+    def succeededStages(self):
+        return [name for name, stage in self.stages.items() if stage['found']]
+
+    def __repr__(self):
+        timings = ', '.join('{}={:.4f}s'.format(name, stage['seconds']) for name, stage in self.stages.items())
+        return 'FactorizationResult({} = {}, {})'.format(self.number, ' * '.join(map(str, self.factors)) or '1', timings)
+
+
+def trial_division(number, primes=TRIAL_PRIMES):
+    # Returns (small prime factors with multiplicity, remaining cofactor)
+    factors = []
+    for prime in primes:
+        if prime * prime > number:
+            break
+        while number % prime == 0:
+            factors.append(prime)
+            number //= prime
+    if 1 < number < TRIAL_LIMIT**2: # nothing below the limit divides it, so it is prime
+        factors.append(number)
+        number = 1
+    return factors, number
+
+def pollard_rho_brent(number, maxIterations=None, rng=random):
+    # A non-trivial factor of an odd composite, or None if the iteration budget runs out
+    maxIterations = maxIterations or RHO_MAX_ITERATIONS
+    if not number & 1:
+        return 2
+    while True:
+        y, c = rng.randrange(1, number), rng.randrange(1, number)
+        power, product, factor = 1, 1, 1
+        iterations = 0
+        while factor == 1:
+            x = y
+            for _ in range(power):
+                y = (y * y + c) % number
+            steps = 0
+            while steps < power and factor == 1:
+                saved = y
+                for _ in range(min(RHO_BATCH, power - steps)):
+                    y = (y * y + c) % number
+                    product = product * (x - y) % number
+                factor = math.gcd(product, number)
+                steps += RHO_BATCH
+            iterations += power # the round that just ran, before the next one doubles
+            power *= 2
+            if factor == 1 and iterations > maxIterations: # a factor found in the last round still counts
+                return None
+        if factor == number: # the batch overshot, replay it one gcd at a time
+            y = saved
+            while True:
+                y = (y * y + c) % number
+                factor = math.gcd(x - y, number)
+                if factor > 1:
+                    break
+        if factor != number:
+            return factor
+        # x and y collided modulo every factor at once, retry with a new polynomial
+
+
+class _FactorFound(Exception):
+    def __init__(self, factor):
+        self.factor = factor
+
+def _inverse(value, number):
+    factor = math.gcd(value, number)
+    if factor != 1:
+        raise _FactorFound(factor)
+    return pow(value, -1, number)
+
+def _ladder(multiplier, x, z, a24, number):
+    # Montgomery ladder on the x-only curve, returns (X:Z) of multiplier * (x:z)
+    x0, z0 = x, z
+    x1, z1 = _double(x, z, a24, number)
+    for bit in bin(multiplier)[3:]:
+        if bit == '1':
+            x0, z0 = _add(x1, z1, x0, z0, x, z, number)
+            x1, z1 = _double(x1, z1, a24, number)
+        else:
+            x1, z1 = _add(x1, z1, x0, z0, x, z, number)
+            x0, z0 = _double(x0, z0, a24, number)
+    return x0, z0
+
+def _double(x, z, a24, number):
+    plus = (x + z) * (x + z) % number
+    minus = (x - z) * (x - z) % number
+    difference = plus - minus
+    return plus * minus % number, difference * (minus + a24 * difference) % number
+
+def _add(xp, zp, xq, zq, xDiff, zDiff, number):
+    u = (xp - zp) * (xq + zq)
+    v = (xp + zp) * (xq - zq)
+    return zDiff * (u + v) * (u + v) % number, xDiff * (u - v) * (u - v) % number
+
+def ecm_stage1(number, B1, curves, rng=random):
+    # A non-trivial factor found on one of `curves` random Suyama curves, or None
+    primes = base_primes(B1)
+    for _ in range(curves):
+        sigma = rng.randrange(6, number - 1)
+        u = (sigma * sigma - 5) % number
+        v = 4 * sigma % number
+        try:
+            # a24 = (A + 2) / 4 = (v - u)^3 (3u + v) / (16 u^3 v)
+            a24 = mod_exp(v - u, 3, number) * (3*u + v) * _inverse(16 * mod_exp(u, 3, number) * v, number) % number
+        except _FactorFound as found:
+            if found.factor != number:
+                return found.factor
+            continue
+        x, z = mod_exp(u, 3, number), mod_exp(v, 3, number)
+        for prime in primes:
+            primePower = prime
+            while primePower * prime <= B1:
+                primePower *= prime
+            x, z = _ladder(primePower, x, z, a24, number)
+        factor = math.gcd(z, number)
+        if 1 < factor < number:
+            return factor
+    return None
+
+
+def factorize(number, rng=random):
+    if number < 1:
+        raise ValueError('factorize needs a positive integer')
+    result = FactorizationResult(number)
+
+    start = time.perf_counter()
+    smallFactors, cofactor = trial_division(number)
+    result.stages['trial']['seconds'] = time.perf_counter() - start
+    result.stages['trial']['found'].extend(smallFactors)
+    result.factors.extend(smallFactors)
+
+    pending = [cofactor] if cofactor > 1 else []
+    while pending:
+        composite = pending.pop()
+        if deterministic_miller_rabin(composite) == 'prime':
+            result.factors.append(composite)
+            continue
+        factor = _split(composite, result, rng)
+        if factor is None:
+            result.unfactored.append(composite)
+        else:
+            pending.extend((factor, composite // factor))
+
+    result.factors.sort()
+    return result
+
+def _split(composite, result, rng):
+    root = math.isqrt(composite)
+    if root * root == composite: # rho and ECM both struggle with p^2, take the square root directly
+        return root
+
+    start = time.perf_counter()
+    factor = pollard_rho_brent(composite, rng=rng)
+    result.stages['rho']['seconds'] += time.perf_counter() - start
+    if factor is not None:
+        result.stages['rho']['found'].append(factor)
+        return factor
+
+    start = time.perf_counter()
+    for B1, curves in ECM_SCHEDULE:
+        factor = ecm_stage1(composite, B1, curves, rng)
+        if factor is not None:
+            break
+    result.stages['ecm']['seconds'] += time.perf_counter() - start
+    if factor is not None:
+        result.stages['ecm']['found'].append(factor)
+    return factor
@@ -0,0 +1,179 @@
+import importlib.util
+from collections import OrderedDict
+
+# Modular exponentiation engine. Every backend computes expBase**exponent % mod
+# without recursion, so the stack depth no longer grows with the size of the key.
+# Backends are kept in a registry so fermat() and miller_rabin() don't need to
+# know which one is doing the work.
+
+WINDOW_BITS = 5
+
+def ladder_mod_exp(expBase, exponent, mod):
+    # Montgomery ladder: walks the exponent bits from the top, one multiply and one square per bit, O(1) stack
+    if mod == 1:
+        return 0
+    low, high = 1, expBase % mod
+    for bit in range(exponent.bit_length() - 1, -1, -1):
+        if (exponent >> bit) & 1:
+            low = (low * high) % mod
+            high = (high * high) % mod
+        else:
+            high = (low * high) % mod
+            low = (low * low) % mod
+    return low
+
+def window_mod_exp(expBase, exponent, mod):
+    # Left-to-right sliding window over the exponent bits, only odd powers are precomputed
+    if mod == 1:
+        return 0
+    if exponent == 0:
+        return 1
+    expBase %= mod
+    square = (expBase * expBase) % mod
+    oddPowers = [expBase]
+    for _ in range((1 << (WINDOW_BITS - 1)) - 1): # expBase^1, expBase^3, ..., expBase^(2^w - 1)
+        oddPowers.append((oddPowers[-1] * square) % mod)
+
+    result = 1
+    bit = exponent.bit_length() - 1
+    while bit >= 0:
+        if not (exponent >> bit) & 1:
+            result = (result * result) % mod
+            bit -= 1
+            continue
+        low = max(bit - WINDOW_BITS + 1, 0) # longest window ending in a set bit
+        while not (exponent >> low) & 1:
+            low += 1
+        for _ in range(bit - low + 1):
+            result = (result * result) % mod
+        window = (exponent >> low) & ((1 << (bit - low + 1)) - 1)
+        result = (result * oddPowers[window >> 1]) % mod
+        bit = low - 1
+    return result
+
+def builtin_mod_exp(expBase, exponent, mod):
+    return pow(expBase, exponent, mod)
+
+_backends = {
+    'builtin': builtin_mod_exp,
+    'ladder': ladder_mod_exp,
+    'window': window_mod_exp,
+}
+
+if importlib.util.find_spec('gmpy2') is not None:
+    import gmpy2
+
+    def gmpy2_mod_exp(expBase, exponent, mod):
+        return int(gmpy2.powmod(expBase, exponent, mod))
+
+    _backends['gmpy2'] = gmpy2_mod_exp
+    _active = 'gmpy2'
+else:
+    _active = 'builtin'
+
+def register_backend(name, function):
+    _backends[name] = function
+
+def available_backends():
+    return sorted(_backends)
+
+def get_backend():
+    return _active
+
+def set_backend(name):
+    global _active
+    if name not in _backends:
+        raise ValueError('Unknown mod_exp backend: {}'.format(name))
+    _active = name
+
+def mod_exp(expBase, exponent, mod, backend=None):
+    if exponent < 0:
+        raise ValueError('mod_exp needs a non-negative exponent')
+    return _backends[backend or _active](expBase, exponent, mod)
+
+
+DEFAULT_MAX_TABLES = 8
+DEFAULT_BUILD_AFTER = 2
+
+class ModExpContext:
+    # Per-modulus exponentiation state. The first time a base is seen it goes
+    # through the active backend like any other call; once a base has been used
+    # buildAfter times, a fixed-base window table g^(2^(w*i)) is built for it and
+    # later exponents cost about bits/w + 2^w multiplications and no squarings
+    # (Brickell-Gordon-McCurley-Wilson). At most maxTables tables are kept, the
+    # least recently used one is evicted first.
+    #
+    # Residues are kept in ordinary form rather than Montgomery form: in CPython a
+    # pure-Python REDC costs three big multiplications, which is slower than the
+    # one multiplication and C-level long division it replaces.
+
+    def __init__(self, mod, maxTables=DEFAULT_MAX_TABLES, buildAfter=DEFAULT_BUILD_AFTER):
+        if mod < 1:
+            raise ValueError('ModExpContext needs a positive modulus')
+        self.mod = mod
+        self.maxTables = maxTables
+        self.buildAfter = buildAfter
+        self.exponentBits = max(mod.bit_length(), 1) # exponents up to the size of the modulus use the table
+        self.window = min(range(1, 17), key=lambda w: -(-self.exponentBits // w) + (1 << w)) # minimizes t + 2^w
+        self.digits = -(-self.exponentBits // self.window)
+        self._tables = OrderedDict() # base -> [base^(2^(w*i)) for i < digits], oldest first
+        self._uses = OrderedDict() # base -> times seen without a table
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def pow(self, expBase, exponent):
+        if exponent < 0:
+            raise ValueError('mod_exp needs a non-negative exponent')
+        expBase %= self.mod
+        table = self._tables.get(expBase)
+        if table is None:
+            if exponent.bit_length() > self.exponentBits or not self._shouldBuild(expBase):
+                self.misses += 1
+                return mod_exp(expBase, exponent, self.mod)
+            table = self._buildTable(expBase)
+        elif exponent.bit_length() > self.exponentBits:
+            self.misses += 1
+            return mod_exp(expBase, exponent, self.mod)
+        else:
+            self._tables.move_to_end(expBase)
+        self.hits += 1
+        return self._fixedBasePow(table, exponent)
+
+    def _shouldBuild(self, expBase):
+        uses = self._uses.pop(expBase, 0) + 1
+        if uses >= self.buildAfter:
+            return True
+        self._uses[expBase] = uses
+        while len(self._uses) > 4 * self.maxTables: # the use counters are bounded too
+            self._uses.popitem(last=False)
+        return False
+
+    def _buildTable(self, expBase):
+        table = [expBase % self.mod]
+        for _ in range(self.digits - 1):
+            table.append(pow(table[-1], 1 << self.window, self.mod))
+        self._tables[expBase] = table
+        while len(self._tables) > self.maxTables:
+            self._tables.popitem(last=False)
+            self.evictions += 1
+        return table
+
+    def _fixedBasePow(self, table, exponent):
+        mod = self.mod
+        mask = (1 << self.window) - 1
+        byDigit = [[] for _ in range(mask + 1)] # byDigit[j] lists the table positions whose window digit is j
+        position = 0
+        while exponent:
+            byDigit[exponent & mask].append(table[position])
+            exponent >>= self.window
+            position += 1
+        result = partial = 1 % mod
+        for digit in range(mask, 0, -1):
+            for power in byDigit[digit]:
+                partial = (partial * power) % mod
+            result = (result * partial) % mod
+        return result
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'tables': len(self._tables)}
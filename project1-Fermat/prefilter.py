@@ -0,0 +1,63 @@
+import math
+
+# Trial-division prefilter that runs before any modular exponentiation. A wheel
+# over 2*3*5*7 throws out most candidates with a single table lookup, and one gcd
+# against the product of every prime below SMALL_PRIME_LIMIT catches the rest of
+# the small factors.
+
+SMALL_PRIME_LIMIT = 1000
+WHEEL_MODULUS = 2 * 3 * 5 * 7
+
+def _primes_below(limit):
+    isPrime = bytearray([1]) * limit
+    isPrime[0:2] = b'\x00\x00'
+    for candidate in range(2, math.isqrt(limit - 1) + 1):
+        if isPrime[candidate]:
+            isPrime[candidate*candidate::candidate] = bytes(len(range(candidate*candidate, limit, candidate)))
+    return [number for number in range(limit) if isPrime[number]]
+
+SMALL_PRIMES = _primes_below(SMALL_PRIME_LIMIT)
+SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+PRIMORIAL = math.prod(SMALL_PRIMES)
+
+# WHEEL[r] is 1 when a number that is r mod 210 has no factor of 2, 3, 5 or 7
+WHEEL = bytes(1 if math.gcd(residue, WHEEL_MODULUS) == 1 else 0 for residue in range(WHEEL_MODULUS))
+
+# Anything below the square of the next prime that survives the gcd has no factor left to find
+PROVEN_PRIME_LIMIT = 1009**2
+
+class PrefilterStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0 # answered without a modular exponentiation
+        self.misses = 0 # passed through to the real test
+        self.exponentiationsSaved = 0
+
+    def __repr__(self):
+        return 'PrefilterStats(hits={}, misses={}, exponentiationsSaved={})'.format(self.hits, self.misses, self.exponentiationsSaved)
+
+stats = PrefilterStats()
+
+def small_prime_filter(testNumber, trials=1):
+    # Returns 'prime' or 'composite' when trial division settles it, None when the full test must run.
+    # trials is how many exponentiations the caller would spend on a prime, used for the savings counter.
+    verdict = _classify(testNumber)
+    if verdict is None:
+        stats.misses += 1
+    else:
+        stats.hits += 1
+        stats.exponentiationsSaved += trials if verdict == 'prime' else 1 # a composite usually fails on the first trial
+    return verdict
+
+def _classify(testNumber):
+    if testNumber < SMALL_PRIME_LIMIT:
+        return 'prime' if testNumber in SMALL_PRIME_SET else 'composite'
+    if not WHEEL[testNumber % WHEEL_MODULUS]:
+        return 'composite'
+    if math.gcd(testNumber, PRIMORIAL) != 1:
+        return 'composite'
+    if testNumber < PROVEN_PRIME_LIMIT:
+        return 'prime'
+    return None
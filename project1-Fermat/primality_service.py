@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+# Headless entry point for the primality tests; nothing here touches Qt.
+#
+#   python primality_service.py check 97 561 7919 --k 20
+#   python primality_service.py serve --socket /tmp/primality.sock
+#   python primality_service.py serve --port 8312
+#
+# The server speaks a line protocol. Each request is one line of whitespace
+# separated integers, optionally with k=<trials> and mode=<random|deterministic>
+# tokens, e.g. "k=20 mode=deterministic 97 561 7919". Each response is one line
+# of JSON:
+#
+#   {"results": [{"n": 97, "fermat": "prime", "millerRabin": "prime", "probability": 1.0}, ...]}
+#
+# or {"error": "..."} if the line could not be parsed. In deterministic mode a
+# prime past the proven witness sets is settled by Baillie-PSW, which has no
+# error bound; its result has "probability": null and
+# "note": "BPSW, no known counterexample". Batches are cut into
+# chunks and run on a process pool, so the event loop stays free to accept
+# more clients while the CPU work happens elsewhere.
+#
+# Heavy imports (asyncio, the primality modules, the process pool) happen
+# inside the functions that need them, so importing this module costs next to
+# nothing.
+
+import sys
+
+DEFAULT_K = 20
+DEFAULT_MODE = 'random'
+CHUNKSIZE = 64
+MAX_LINE = 1 << 20
+
+
+def validateK(k):
+	# Same rule for the server's k= token and the CLI's --k
+	if k < 1:
+		raise ValueError('k must be at least 1')
+	return k
+
+def parseRequest(line):
+	# Returns (numbers, k, mode) or raises ValueError
+	numbers = []
+	k, mode = DEFAULT_K, DEFAULT_MODE
+	for token in line.split():
+		if token.startswith('k='):
+			k = validateK(int(token[2:]))
+		elif token.startswith('mode='):
+			mode = token[5:]
+			if mode not in ('random', 'deterministic'):
+				raise ValueError('unknown mode: {}'.format(mode))
+		else:
+			number = int(token)
+			if number < 2:
+				raise ValueError('{} is too small to test, N must be at least 2'.format(number))
+			numbers.append(number)
+	return numbers, k, mode
+
+def describe(numbers, k, mode, verdicts):
+	from fermat import BPSW_LABEL, fprobability, mprobability
+	results = []
+	for number, (fermatResult, mrResult) in zip(numbers, verdicts):
+		probability = mprobability(k, number, mode) if mrResult == 'prime' else None
+		result = {
+			'n': number,
+			'fermat': fermatResult,
+			'millerRabin': mrResult,
+			'fermatProbability': fprobability(k) if fermatResult == 'prime' else None,
+			'probability': probability,
+		}
+		if mrResult == 'prime' and probability is None: # deterministic mode past the proven witness sets
+			result['note'] = BPSW_LABEL
+		results.append(result)
+	return results
+
+def checkNumbers(numbers, k, mode):
+	from fermat import prime_test
+	return describe(numbers, k, mode, [prime_test(number, k, mode) for number in numbers])
+
+
+async def _answer(line, loop, pool):
+	import asyncio
+	import json
+	from batch import test_chunk
+	try:
+		numbers, k, mode = parseRequest(line)
+	except ValueError as error:
+		return json.dumps({'error': str(error)})
+	chunks = [numbers[start:start + CHUNKSIZE] for start in range(0, len(numbers), CHUNKSIZE)]
+	chunkResults = await asyncio.gather(*[loop.run_in_executor(pool, test_chunk, chunk, k, mode) for chunk in chunks])
+	verdicts = [verdict for chunk in chunkResults for verdict in chunk]
+	return json.dumps({'results': describe(numbers, k, mode, verdicts)})
+
+async def _serve(socketPath, host, port, workers):
+	import asyncio
+	from concurrent.futures import ProcessPoolExecutor
+
+	loop = asyncio.get_running_loop()
+	pool = ProcessPoolExecutor(max_workers=workers)
+
+	async def handleClient(reader, writer):
+		try:
+			while True:
+				line = await reader.readline()
+				if not line:
+					break
+				response = await _answer(line.decode('ascii', 'replace'), loop, pool)
+				writer.write(response.encode('ascii') + b'\n')
+				await writer.drain()
+		except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+			pass # client went away or sent an oversized line
+		finally:
+			writer.close()
+
+	if socketPath:
+		server = await asyncio.start_unix_server(handleClient, path=socketPath, limit=MAX_LINE)
+		where = socketPath
+	else:
+		server = await asyncio.start_server(handleClient, host=host, port=port, limit=MAX_LINE)
+		where = '{}:{}'.format(host, port)
+	print('primality service listening on {}'.format(where), file=sys.stderr)
+	try:
+		async with server:
+			await server.serve_forever()
+	finally:
+		pool.shutdown(cancel_futures=True)
+
+def serve(socketPath=None, host='127.0.0.1', port=8312, workers=None):
+	import asyncio
+	asyncio.run(_serve(socketPath, host, port, workers))
+
+
+def main(argv=None):
+	import argparse
+	import json
+
+	parser = argparse.ArgumentParser(description='Headless Fermat / Miller-Rabin primality testing')
+	commands = parser.add_subparsers(dest='command', required=True)
+
+	check = commands.add_parser('check', help='test the given numbers and print JSON results')
+	check.add_argument('numbers', nargs='*', help='numbers to test; read from stdin when omitted')
+	check.add_argument('--k', type=int, default=DEFAULT_K)
+	check.add_argument('--mode', choices=('random', 'deterministic'), default=DEFAULT_MODE)
+
+	server = commands.add_parser('serve', help='run the line-protocol server')
+	server.add_argument('--socket', help='listen on this unix socket instead of TCP')
+	server.add_argument('--host', default='127.0.0.1')
+	server.add_argument('--port', type=int, default=8312)
+	server.add_argument('--workers', type=int, help='process pool size, defaults to the CPU count')
+
+	args = parser.parse_args(argv)
+	if args.command == 'serve':
+		serve(args.socket, args.host, args.port, args.workers)
+		return 0
+
+	text = ' '.join(args.numbers) if args.numbers else sys.stdin.read()
+	try:
+		numbers, _, _ = parseRequest(text)
+		validateK(args.k)
+	except ValueError as error:
+		print(json.dumps({'error': str(error)}))
+		return 1
+	for result in checkNumbers(numbers, args.k, args.mode):
+		print(json.dumps(result))
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,68 @@
+import math
+import random
+
+from fermat import miller_rabin
+from sieve import base_primes
+
+# Random prime generator for key material. Rather than drawing a fresh random
+# odd number per attempt, it picks one random start and sieves a window of odd
+# offsets start, start+2, start+4, ... against the small primes. Computing
+# start mod p once per prime crosses off every multiple of p in the window, so
+# only the survivors pay for a Miller-Rabin test.
+
+SIEVE_PRIME_LIMIT = 1 << 14
+DEFAULT_TRIALS = 40
+PRIMES_PER_PRODUCT = 64
+
+_SIEVE_PRIMES = base_primes(SIEVE_PRIME_LIMIT)[1:] # odd primes only, the window holds odd numbers
+
+def _sieve_window(start, window, primes):
+    # survivors[i] is 1 when start + 2*i has no factor in primes
+    survivors = bytearray([1]) * window
+    for group in range(0, len(primes), PRIMES_PER_PRODUCT):
+        groupPrimes = primes[group:group + PRIMES_PER_PRODUCT]
+        residue = start % math.prod(groupPrimes) # one big-int reduction per group, the rest are word-sized
+        for prime in groupPrimes:
+            _cross_off(survivors, window, start, residue % prime, prime)
+    return survivors
+
+def _cross_off(survivors, window, start, startModPrime, prime):
+    # start + 2*i = 0 (mod p)  ->  i = -start * 2^-1 (mod p)
+    first = (-startModPrime * ((prime + 1) // 2)) % prime
+    if start + 2*first == prime: # never cross off the prime itself
+        first += prime
+    survivors[first::prime] = bytes(len(range(first, window, prime)))
+
+def random_primes(bits, k=DEFAULT_TRIALS, window=None, rng=None):
+    # Yields an endless stream of random primes with exactly `bits` bits.
+    # The default window of `bits` odd offsets spans about 3x the average prime gap, ln 2^bits.
+    if bits < 2:
+        raise ValueError('A prime needs at least 2 bits')
+    if bits <= 16: # too few numbers to sieve, just sample
+        for prime in _small_random_primes(bits, rng or random):
+            yield prime
+        return
+    rng = rng or random
+    window = window or bits
+    lowest, highest = 1 << (bits - 1), (1 << bits) - 1
+    primes = [prime for prime in _SIEVE_PRIMES if prime * prime <= highest]
+    while True:
+        start = rng.getrandbits(bits) | lowest | 1
+        survivors = _sieve_window(start, window, primes)
+        for offset, survivor in enumerate(survivors):
+            if not survivor:
+                continue
+            candidate = start + 2*offset
+            if candidate > highest:
+                break
+            if miller_rabin(candidate, k) == 'prime':
+                yield candidate
+                break # draw a fresh start so consecutive primes stay independent
+
+def _small_random_primes(bits, rng):
+    candidates = [prime for prime in base_primes((1 << bits) - 1) if prime >= 1 << (bits - 1)]
+    while True:
+        yield rng.choice(candidates)
+
+def random_prime(bits, k=DEFAULT_TRIALS, window=None, rng=None):
+    return next(random_primes(bits, k, window, rng))
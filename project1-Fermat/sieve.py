@@ -0,0 +1,83 @@
+import importlib.util
+import math
+from itertools import compress
+
+# Segmented Sieve of Eratosthenes. The base primes up to sqrt(hi) are sieved
+# once, then [lo, hi) is walked in windows of segment_size numbers, so memory
+# stays at one window plus the base primes (about 10^5 numbers for hi = 10^10)
+# no matter how wide the range is.
+
+DEFAULT_SEGMENT_SIZE = 1 << 18
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+def base_primes(limit):
+    # Every prime <= limit, plain sieve
+    if limit < 2:
+        return []
+    isPrime = bytearray([1]) * (limit + 1)
+    isPrime[0:2] = b'\x00\x00'
+    for candidate in range(2, math.isqrt(limit) + 1):
+        if isPrime[candidate]:
+            isPrime[candidate*candidate::candidate] = bytes(len(range(candidate*candidate, limit + 1, candidate)))
+    return list(compress(range(limit + 1), isPrime))
+
+def _bytearray_segment(start, end, primes):
+    flags = bytearray([1]) * (end - start)
+    for prime in primes:
+        first = max(prime * prime, (start + prime - 1) // prime * prime) # first multiple in the window that isn't prime itself
+        if first >= end:
+            continue
+        flags[first - start::prime] = bytes(len(range(first, end, prime)))
+    for number in range(start, min(end, 2)): # 0 and 1
+        flags[number - start] = 0
+    return flags
+
+def _numpy_segment(start, end, primes):
+    import numpy as np
+    flags = np.ones(end - start, dtype=np.bool_)
+    for prime in primes:
+        first = max(prime * prime, (start + prime - 1) // prime * prime)
+        if first < end:
+            flags[first - start::prime] = False
+    flags[:max(0, min(end, 2) - start)] = False
+    return flags
+
+_backends = {'bytearray': _bytearray_segment, 'numpy': _numpy_segment}
+
+def segments(lo, hi, segment_size=DEFAULT_SEGMENT_SIZE, backend='bytearray'):
+    # Yields (start, flags) where flags[i] is true when start + i is prime, windows cover [lo, hi)
+    if backend not in _backends:
+        raise ValueError('Unknown sieve backend: {}'.format(backend))
+    if backend == 'numpy' and not HAS_NUMPY:
+        raise ImportError('The numpy sieve backend needs numpy installed')
+    lo = max(lo, 0)
+    if hi <= lo:
+        return
+    sieveSegment = _backends[backend]
+    primes = base_primes(math.isqrt(hi - 1))
+    for start in range(lo, hi, segment_size):
+        end = min(start + segment_size, hi)
+        yield start, sieveSegment(start, end, primes)
+
+def is_prime_range(lo, hi, segment_size=DEFAULT_SEGMENT_SIZE, backend='bytearray'):
+    # One flag per number in [lo, hi), for ranges small enough to hold at once
+    flags = bytearray()
+    for _, segmentFlags in segments(lo, hi, segment_size, backend):
+        flags += bytes(segmentFlags)
+    return flags
+
+def primes(lo, hi, segment_size=DEFAULT_SEGMENT_SIZE, backend='bytearray'):
+    # Lazily yields the primes in [lo, hi) in increasing order
+    for start, flags in segments(lo, hi, segment_size, backend):
+        if backend == 'numpy':
+            for offset in flags.nonzero()[0].tolist():
+                yield start + offset
+        else:
+            yield from compress(range(start, start + len(flags)), flags)
+
+def count_primes(lo, hi, segment_size=DEFAULT_SEGMENT_SIZE, backend='bytearray'):
+    total = 0
+    for _, flags in segments(lo, hi, segment_size, backend):
+        total += int(flags.sum()) if backend == 'numpy' else len(flags) - flags.count(0)
+    return total
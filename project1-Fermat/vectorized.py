@@ -0,0 +1,145 @@
+import numpy as np
+
+# Lane-wise Fermat and Miller-Rabin over NumPy uint64 arrays. Every candidate
+# is a lane and each step of modular exponentiation runs across all lanes at
+# once, so word-sized batches skip the per-number Python big-int calls.
+#
+# When every modulus is below 2^32 a product of two residues fits in a uint64
+# and the fast path is a plain multiply and %. Larger moduli (up to 2^64 - 1)
+# go through _mulmod_wide, which builds the 128-bit product from 32-bit limbs
+# and reduces it one bit at a time, so nothing ever wraps.
+
+UINT64 = np.uint64
+LOW_MASK = UINT64(0xFFFFFFFF)
+TOP_BIT = UINT64(1 << 63)
+
+# Miller-Rabin bases that are proven sufficient below the bound
+BASES_32 = (2, 7, 61) # N < 4,759,123,141
+BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022) # N < 2^64
+
+TRIAL_PRIMES = (3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47)
+
+def _as_uint64(values):
+    array = np.asarray(values)
+    if array.dtype != UINT64:
+        array = array.astype(UINT64)
+    return array
+
+def _mulmod_narrow(a, b, mod):
+    return (a * b) % mod
+
+def _mulmod_wide(a, b, mod):
+    # (a * b) mod m for a, b < m < 2^64 without overflow
+    aLow, aHigh = a & LOW_MASK, a >> UINT64(32)
+    bLow, bHigh = b & LOW_MASK, b >> UINT64(32)
+    lowLow = aLow * bLow
+    middle = aLow * bHigh
+    middleOther = aHigh * bLow
+    highHigh = aHigh * bHigh
+
+    # 128-bit product as (high, low), carrying the middle terms across the 64-bit boundary
+    middleSum = middle + middleOther
+    middleCarry = (middleSum < middle).astype(UINT64) << UINT64(32)
+    low = lowLow + (middleSum << UINT64(32))
+    lowCarry = (low < lowLow).astype(UINT64)
+    high = highHigh + (middleSum >> UINT64(32)) + middleCarry + lowCarry
+
+    # high < m because a, b < m, so it is already reduced. Shift in the 64 bits of low one at a time.
+    remainder = high % mod
+    for bit in range(63, -1, -1):
+        overflow = (remainder & TOP_BIT) != 0
+        remainder = (remainder << UINT64(1)) | ((low >> UINT64(bit)) & UINT64(1))
+        # if the doubling wrapped, the true value is remainder + 2^64 >= m, and the wrapped subtraction is exact
+        remainder = np.where(overflow | (remainder >= mod), remainder - mod, remainder)
+    return remainder
+
+def _mulmod_for(moduli):
+    if moduli.size and int(moduli.max()) >= 1 << 32:
+        return _mulmod_wide
+    return _mulmod_narrow
+
+def mod_exp_batch(bases, exponents, moduli):
+    # Right-to-left square and multiply, every lane has its own base, exponent and modulus
+    moduli = _as_uint64(moduli)
+    bases, exponents = np.broadcast_arrays(_as_uint64(bases) % moduli, _as_uint64(exponents))
+    mulmod = _mulmod_for(moduli)
+    result = np.ones_like(moduli) % moduli
+    square = bases.copy()
+    exponent = exponents.copy()
+    while exponent.any():
+        odd = (exponent & UINT64(1)) != 0
+        result = np.where(odd, mulmod(result, square, moduli), result)
+        square = mulmod(square, square, moduli)
+        exponent >>= UINT64(1)
+    return result
+
+def _small_cases(candidates):
+    # (decided, answer) for N < 4, even N and N with a factor in TRIAL_PRIMES
+    answer = (candidates == 2) | (candidates == 3)
+    decided = (candidates < 4) | ((candidates & UINT64(1)) == 0)
+    for prime in TRIAL_PRIMES:
+        hit = (candidates % UINT64(prime) == 0) & ~decided
+        answer |= hit & (candidates == prime)
+        decided |= hit
+    return decided, answer
+
+def _default_bases(candidates):
+    if candidates.size and int(candidates.max()) >= 4759123141:
+        return BASES_64
+    return BASES_32
+
+def miller_rabin_batch(candidates, witnesses=None):
+    # Boolean array, True where the candidate is a probable prime for every witness.
+    # witnesses is a 1-D array shared by every lane, a 2-D (len(candidates), w) array, or None
+    # for the deterministic bases, which make the answer exact for any uint64 input.
+    candidates = _as_uint64(candidates)
+    if witnesses is None:
+        witnesses = np.array(_default_bases(candidates), dtype=UINT64)
+    witnesses = _as_uint64(witnesses)
+    if witnesses.ndim == 1:
+        witnesses = np.broadcast_to(witnesses, candidates.shape + witnesses.shape)
+
+    decided, isPrime = _small_cases(candidates)
+    pending = np.flatnonzero(~decided)
+    testNumbers = candidates[pending]
+    mulmod = _mulmod_for(testNumbers)
+
+    # N - 1 = 2^s * d, per lane
+    d = testNumbers - UINT64(1)
+    s = np.zeros_like(d)
+    evenLanes = (d & UINT64(1)) == 0
+    while evenLanes.any():
+        d = np.where(evenLanes, d >> UINT64(1), d)
+        s += evenLanes
+        evenLanes = (d & UINT64(1)) == 0
+
+    probablePrime = np.ones(testNumbers.shape, dtype=np.bool_)
+    minusOne = testNumbers - UINT64(1)
+    for column in range(witnesses.shape[-1]):
+        bases = witnesses[pending, column] % testNumbers
+        x = mod_exp_batch(bases, d, testNumbers)
+        passed = (bases == 0) | (x == 1) | (x == minusOne) # a base that is a multiple of N says nothing
+        for squaring in range(1, int(s.max()) if s.size else 0):
+            x = mulmod(x, x, testNumbers)
+            passed |= (x == minusOne) & (UINT64(squaring) < s)
+        probablePrime &= passed
+
+    isPrime[pending] = probablePrime
+    return isPrime
+
+def fermat_batch(candidates, witnesses):
+    # Boolean array, True where witness^(N-1) = 1 (mod N) for every witness
+    candidates = _as_uint64(candidates)
+    witnesses = _as_uint64(witnesses)
+    if witnesses.ndim == 1:
+        witnesses = np.broadcast_to(witnesses, candidates.shape + witnesses.shape)
+
+    decided, isPrime = _small_cases(candidates)
+    pending = np.flatnonzero(~decided)
+    testNumbers = candidates[pending]
+    probablePrime = np.ones(testNumbers.shape, dtype=np.bool_)
+    for column in range(witnesses.shape[-1]):
+        bases = witnesses[pending, column] % testNumbers
+        probablePrime &= (bases == 0) | (mod_exp_batch(bases, testNumbers - UINT64(1), testNumbers) == 1)
+    isPrime[pending] = probablePrime
+    return isPrime
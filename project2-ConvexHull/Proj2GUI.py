@@ -7,6 +7,8 @@ import signal
 import sys
 import time
 
+import numpy as np
+
 
 from which_pyqt import PYQT_VER
 if PYQT_VER == 'PYQT5':
@@ -31,6 +33,11 @@ from convex_hull import *
 # This class controls the visual stuff in the GUI.  An instance of it is passed to the solver
 # when it is called so that wrapper functions in the file "convex_hull.py" can update the GUI
 #
+# Points are drawn from a cache: the coordinates of each color go into a NumPy array once per
+# point set, and for each window size they are mapped to pixels, thinned to one point per pixel
+# and packed into a QPolygonF, so a repaint is one drawPoints call per color however many
+# points there are. Lines are drawn with one drawLines call per color.
+#
 class PointLineView( QWidget ):
 	def __init__( self, status_bar ):
 		super(QWidget,self).__init__()
@@ -40,6 +47,10 @@ class PointLineView( QWidget ):
 		self.lineList   = {}
 		self.status_bar = status_bar
 
+		self.pointArrays   = {}	# color -> (n, 2) float64 array of that color's points
+		self.pointPolygons = {}	# color -> QPolygonF in pixel coordinates for self.polygonSize
+		self.polygonSize   = None
+
 	def displayStatusText(self, text):
 		self.status_bar.showMessage(text)
 		self.update()
@@ -47,6 +58,8 @@ class PointLineView( QWidget ):
 
 	def clearPoints(self):
 		self.pointList = {}
+		self.pointArrays = {}
+		self.pointPolygons = {}
 
 	def clearLines(self, lines=None):
 		if(not lines):
@@ -66,6 +79,8 @@ class PointLineView( QWidget ):
 			self.pointList[color].extend( point_list )
 		else:
 			self.pointList[color] = point_list
+		self.pointArrays.pop(color, None)
+		self.pointPolygons.pop(color, None)
 
 	def addLines( self, line_list, color ):
 		if color in self.lineList:
@@ -75,9 +90,7 @@ class PointLineView( QWidget ):
 		self.update()
 		app.processEvents()
 
-	def paintEvent(self, event):
-		painter = QPainter(self)
-
+	def getScale(self):
 		w = self.width() / 2.0
 		h = self.height() / 2.0
 		w2h_desired_ratio = 1.5
@@ -85,25 +98,65 @@ class PointLineView( QWidget ):
 			h = w / w2h_desired_ratio
 		else:
 			w = h * w2h_desired_ratio
+		return w, h
+
+	def getPointPolygon(self, color):
+		size = (self.width(), self.height())
+		if size != self.polygonSize: # pixel positions changed, every color has to be thinned again
+			self.pointPolygons = {}
+			self.polygonSize = size
+		if color not in self.pointPolygons:
+			if color not in self.pointArrays:
+				points = self.pointList[color]
+				coordinates = np.fromiter((value for point in points for value in (point.x(), point.y())), dtype=np.float64, count=2*len(points))
+				self.pointArrays[color] = coordinates.reshape(-1, 2)
+			self.pointPolygons[color] = self.thinToPixels(self.pointArrays[color])
+		return self.pointPolygons[color]
+
+	def thinToPixels(self, coordinates):
+		# Maps points to whole pixels and keeps one point per pixel, in the widget's own coordinates
+		width, height = self.width(), self.height()
+		w, h = self.getScale()
+		columns = np.rint(width/2.0 + w*coordinates[:, 0]).astype(np.int64)
+		rows = np.rint(height/2.0 - h*coordinates[:, 1]).astype(np.int64)
+		visible = (columns >= 0) & (columns < width) & (rows >= 0) & (rows < height)
+		occupied = np.zeros(width * height, dtype=bool)
+		occupied[rows[visible] * width + columns[visible]] = True
+		pixels = np.flatnonzero(occupied)
+
+		# Fill a QPolygonF of the right length, then write the pixel coordinates straight into its buffer
+		polygon = QPolygonF()
+		polygon.fill(QPointF(), len(pixels))
+		if len(pixels):
+			buffer = polygon.data()
+			buffer.setsize(16 * len(pixels))
+			view = np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)
+			view[:, 0] = pixels % width
+			view[:, 1] = pixels // width
+		return polygon
+
+	def paintEvent(self, event):
+		painter = QPainter(self)
+
+		w, h = self.getScale()
 
 		tform = QTransform()
 		tform.translate(self.width()/2.0,self.height()/2.0)
-		tform.scale(1.0,-1.0)
+		tform.scale(w,-h)
 		painter.setTransform(tform)
 
 		for color in self.lineList:
-			c = QColor(color[0],color[1],color[2])
-			painter.setPen( c )
-			for line in self.lineList[color]:
-				ln = QLineF( w*line.x1(), h*line.y1(), w*line.x2(), h*line.y2() )
-				painter.drawLine( ln )
+			pen = QPen( QColor(color[0],color[1],color[2]) )
+			pen.setCosmetic(True) # one pixel wide whatever the scale
+			painter.setPen( pen )
+			painter.drawLines( self.lineList[color] )
 
+		painter.resetTransform()
 		for color in self.pointList:
-			c = QColor(color[0],color[1],color[2])
-			painter.setPen( c )
-			for point in self.pointList[color]:
-				pt = QPointF(w*point.x(), h*point.y())
-				painter.drawEllipse( pt, 1.0, 1.0)
+			pen = QPen( QColor(color[0],color[1],color[2]) )
+			pen.setWidth(2)
+			painter.setPen( pen )
+			painter.drawPoints( self.getPointPolygon(color) )
 
 
 # Main GUI class
@@ -131,7 +184,6 @@ class Proj2GUI( QMainWindow ):
 			random.seed( time.time() )
 
 		ptlist = []
-		unique_xvals = {}
 		max_r  = 0.98
 		WIDTH  = 1.0
 		HEIGHT = 1.0
@@ -143,9 +195,7 @@ class Proj2GUI( QMainWindow ):
 				if x**2+y**2 <= max_r**2:
 					xval = WIDTH*x
 					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1
+					ptlist.append( QPointF(xval,yval) )
 		elif self.distribSphere.isChecked():
 			while len(ptlist) < npoints:
 				x = random.uniform(-1.0,1.0)
@@ -154,9 +204,7 @@ class Proj2GUI( QMainWindow ):
 				if x**2 + y**2 + z**2 <= max_r**2:
 					xval = WIDTH*x
 					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1
+					ptlist.append( QPointF(xval,yval) )
 		elif self.distribGaussian.isChecked():
 			while len(ptlist) < npoints:
 				x = random.gauss(0.0,0.25)
@@ -164,9 +212,7 @@ class Proj2GUI( QMainWindow ):
 				if x**2+y**2 <= max_r**2:
 					xval = WIDTH*x
 					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1
+					ptlist.append( QPointF(xval,yval) )
 		return ptlist
 
 # Methods that handle GUI events
@@ -197,7 +243,10 @@ class Proj2GUI( QMainWindow ):
 		self.solveButton.setEnabled(False)
 		self.view.update()
 		app.processEvents()
-		self.solver.compute_hull(self.points,self.showRecursion.isChecked(),self.view)
+		self.solver.compute_hull(self.points,self.showRecursion.isChecked(),self.view,self.solveFinished)
+
+	# Called by the solver once the hull is drawn, which is after the replay when the recursion is shown
+	def solveFinished(self):
 		self.generateButton.setEnabled(True)
 		self.clearButton.setEnabled(True)
 		self.view.update()
@@ -1,21 +1,86 @@
 from which_pyqt import PYQT_VER
 if PYQT_VER == 'PYQT5':
-	from PyQt5.QtCore import QLineF, QPointF, QObject
+	from PyQt5.QtCore import QLineF, QPointF, QObject, QTimer
 # elif PYQT_VER == 'PYQT4':
 # 	from PyQt4.QtCore import QLineF, QPointF, QObject
 elif PYQT_VER == 'PYQT6':
-	from PyQt6.QtCore import QLineF, QPointF, QObject
+	from PyQt6.QtCore import QLineF, QPointF, QObject, QTimer
 else:
 	raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
 
 import time
-from LinkedListNodeClass import LinkedListNode 
-from ConvexHullClass import ConvexHull
-from typing import List
+import numpy as np
+from geometry.array_hull import ArrayHull
+from geometry.divide_conquer import SHOW_HULL, SHOW_TANGENT, DivideAndConquerSolver, RecordingObserver, SolverObserver, hullSegments, replayEvent
+from geometry.hull_engine import hull_indices
+from geometry.interior_filter import akl_toussaint_filter
+from geometry.presort import presort_order
+from geometry.query import HullQuery
+from typing import Callable, List, Optional
 
 # Global variable that controls the speed of the recursion automation, in seconds
 PAUSE = 0.25
 RED = (255,0,0)
+GREEN = (0,255,0)
+BLUE = (0,0,255)
+# Directions whose extreme points span the interior filter polygon, 4 or 8
+PREFILTER_DIRECTIONS = 8
+
+
+# Forwards the solver's recursion events to the GUI, turning (point, point) segments into QLineF
+class ViewObserver(SolverObserver):
+	def __init__(self, solver: 'ConvexHullSolver'):
+		self.solver = solver
+
+	def toLines(self, segments: list) -> List[QLineF]:
+		return [QLineF(pointOne, pointTwo) for pointOne, pointTwo in segments]
+
+	def showTangent(self, segments: list) -> None:
+		self.solver.showTangent(self.toLines(segments), BLUE)
+
+	def eraseTangent(self, segments: list) -> None:
+		self.solver.eraseTangent(self.toLines(segments))
+
+	def showHull(self, segments: list) -> None:
+		self.solver.showHull(self.toLines(segments), GREEN)
+
+	def eraseHull(self, segments: list) -> None:
+		self.solver.eraseHull(self.toLines(segments))
+
+
+# Replays recorded solver events on the GUI thread from a QTimer. Each tick applies events up to and
+# including the next show, so every tangent or hull drawn stays up for one interval and the solver
+# itself never sleeps.
+class AnimationPlayer(QObject):
+	def __init__(self, observer: SolverObserver):
+		super().__init__()
+		self.observer = observer
+		self.events: list = []
+		self.position = 0
+		self.onFinished: Optional[Callable[[], None]] = None
+		self.timer = QTimer(self)
+		self.timer.timeout.connect(self.step)
+
+	def play(self, events: list, interval: float, onFinished: Optional[Callable[[], None]] = None) -> None:
+		self.timer.stop()
+		self.events, self.position, self.onFinished = events, 0, onFinished
+		self.timer.start(int(interval * 1000))
+
+	def isPlaying(self) -> bool:
+		# Until the tick that calls onFinished, not just until the last event is drawn
+		return self.timer.isActive()
+
+	def step(self) -> None:
+		while self.position < len(self.events):
+			event = self.events[self.position]
+			self.position += 1
+			replayEvent(event, self.observer)
+			if event[0] in (SHOW_TANGENT, SHOW_HULL):
+				return
+		self.timer.stop()
+		self.events, self.position = [], 0
+		if self.onFinished is not None:
+			self.onFinished()
 
 
 class ConvexHullSolver(QObject):
@@ -23,13 +88,13 @@ class ConvexHullSolver(QObject):
 	def __init__(self):
 		super().__init__()
 		self.pause = False
+		self.player = AnimationPlayer(ViewObserver(self))
+		self.hullQuery: Optional[HullQuery] = None # containment, diameter, width, ... of the last hull solved
 
 	# Helper methods to interact with the GUI
 	
 	def showTangent(self, line, color):
 		self.view.addLines(line,color)
-		if self.pause:
-			time.sleep(PAUSE)
 
 	def eraseTangent(self, line):
 		self.view.clearLines(line)
@@ -40,8 +105,6 @@ class ConvexHullSolver(QObject):
 
 	def showHull(self, polygon, color):
 		self.view.addLines(polygon,color)
-		if self.pause:
-			time.sleep(PAUSE)
 
 	def eraseHull(self,polygon):
 		self.view.clearLines(polygon)
@@ -49,198 +112,77 @@ class ConvexHullSolver(QObject):
 	def showText(self,text):
 		self.view.displayStatusText(text)
 
-	# Hull solver main function and helper functions
-
-	def cHullSolver(self, points: List[QPointF]) -> ConvexHull:
-		if len(points) <= 3:
-			return self.createSmallHull(points)
-		else:
-			leftHull: ConvexHull = self.cHullSolver(points[:len(points)//2])
-			rightHull: ConvexHull = self.cHullSolver(points[len(points)//2:])
-			return self.mergeHulls(leftHull, rightHull)
-
-	# this is the smallest hull with only 2-3 points
-	def createSmallHull(self, points: List[QPointF]) -> ConvexHull:
-		if len(points) == 2:
-			return self.twoPointsToHull(points)
-		else:
-			return self.threePointsToHull(points)
-	
-	def twoPointsToHull(self, points: List[QPointF]) -> ConvexHull:
-		leftNode: LinkedListNode = LinkedListNode(points[0], None, None)
-		rightNode: LinkedListNode = LinkedListNode(points[1], None, None)
-		leftNode.setPointTo(rightNode)
-		rightNode.setPointTo(leftNode)
-		
-		return ConvexHull(leftNode, rightNode)
-	
-	def threePointsToHull(self, points: List[QPointF]) -> ConvexHull:
-		highPoint, lowPoint = self.getHighAndLowPoint(points[1], points[2])
-		leftNode: LinkedListNode = LinkedListNode(points[0], None, None)
-		highNode: LinkedListNode = LinkedListNode(highPoint, None, None)
-		lowNode: LinkedListNode = LinkedListNode(lowPoint, None, None)
-		if self.isClockwise(leftNode, highNode, lowNode):
-			leftNode.setPointTo(highNode)
-			highNode.setPointTo(lowNode)
-			lowNode.setPointTo(leftNode)
-		else:
-			highNode.setPointTo(leftNode)
-			lowNode.setPointTo(highNode)
-			leftNode.setPointTo(lowNode)
-
-		rightNode: LinkedListNode = self.getRightmostNode(highNode, lowNode)
-		return ConvexHull(leftNode, rightNode)
-
-	def isClockwise(self, nodeOne: LinkedListNode, nodeTwo: LinkedListNode, nodeThree: LinkedListNode) -> bool:
-		nodeOneTwoSlope = self.getSlope(nodeOne, nodeTwo)
-		nodeTwoThreeSlope = self.getSlope(nodeTwo, nodeThree)
-		nodeThreeOneSlope = self.getSlope(nodeThree, nodeOne)
-		if (nodeOneTwoSlope <= nodeTwoThreeSlope < nodeThreeOneSlope or 
-			nodeTwoThreeSlope < nodeThreeOneSlope <= nodeOneTwoSlope or 
-			nodeThreeOneSlope <= nodeOneTwoSlope < nodeTwoThreeSlope):
-			return True
-		else:
-			return False
-	
-	def getRightmostNode(self, nodeOne: LinkedListNode, nodeTwo: LinkedListNode) -> LinkedListNode:
-		if nodeOne.getXCoordinate() > nodeTwo.getXCoordinate():
-			return nodeOne
-		else:
-			return nodeTwo
-
-	def getHighAndLowPoint(self, nodeOne: QPointF, nodeTwo: QPointF) -> tuple[QPointF, QPointF]:
-		if nodeOne.y() > nodeTwo.y():
-			return nodeOne, nodeTwo
-		else:
-			return nodeTwo, nodeOne
-		
-	def mergeHulls(self, leftHull: ConvexHull, rightHull: ConvexHull) -> ConvexHull:
-		leftHullTopNode, rightHullTopNode = self.getTopTangent(leftHull, rightHull)
-		rightHullBottomNode, leftHullBottomNode = self.getLowerTangent(leftHull, rightHull)
-		leftHullTopNode.setPointTo(rightHullTopNode)
-		rightHullBottomNode.setPointTo(leftHullBottomNode)
-		return ConvexHull(leftHull.getLeftNode(), rightHull.getRightNode())
-
-	def getTopTangent(self, leftHull: ConvexHull, rightHull: ConvexHull) -> tuple[LinkedListNode, LinkedListNode]:
-		currLeftTopNode: LinkedListNode = leftHull.getRightNode()
-		currRightTopNode: LinkedListNode = rightHull.getLeftNode()
-
-		changed = True
-		while changed:
-			currLeftTopNode, negChanged = self.getMostNegativeSlope(currRightTopNode, currLeftTopNode, False)
-			currRightTopNode, posChanged = self.getMostPositiveSlope(currLeftTopNode, currRightTopNode, True)
-			changed = negChanged or posChanged
-
-		return currLeftTopNode, currRightTopNode
-
-	def getLowerTangent(self, leftHull: ConvexHull, rightHull: ConvexHull) -> tuple[LinkedListNode, LinkedListNode]:
-		currLeftLowerNode: LinkedListNode = leftHull.getRightNode()
-		currRightLowerNode: LinkedListNode = rightHull.getLeftNode()
-
-		changed = True
-		while changed:
-			currLeftLowerNode, posChanged = self.getMostPositiveSlope(currRightLowerNode, currLeftLowerNode, True)
-			currRightLowerNode, negChanged = self.getMostNegativeSlope(currLeftLowerNode, currRightLowerNode, False)
-			changed = negChanged or posChanged
-
-		return currRightLowerNode, currLeftLowerNode
-
-	def getMostNegativeSlope(self, staticNode: LinkedListNode, movingNode: LinkedListNode, clockwise: bool) -> tuple[LinkedListNode, bool]:
-		currLowSlope: float = self.getSlope(movingNode, staticNode)
-		lowNode: LinkedListNode = movingNode
-		changed = False
-
-		if clockwise:
-			while True:
-				nextNode: LinkedListNode = movingNode.getPointsTo()
-				nextNodeSlope = self.getSlope(nextNode, staticNode)
-				if nextNodeSlope < currLowSlope:
-					currLowSlope = nextNodeSlope
-					lowNode = nextNode
-					changed = True
-					nextNode = nextNode.getPointsTo()
-				else:
-					break
-		else:
-			while True:
-				nextNode: LinkedListNode = movingNode.getPointsFrom()
-				nextNodeSlope = self.getSlope(nextNode, staticNode)
-				if nextNodeSlope < currLowSlope:
-					currLowSlope = nextNodeSlope
-					lowNode = nextNode
-					changed = True
-					nextNode = nextNode.getPointsFrom()
-				else:
-					break
-
-		return lowNode, changed
-	
-	def getMostPositiveSlope(self, staticNode: LinkedListNode, movingNode: LinkedListNode, clockwise: bool) -> tuple[LinkedListNode, bool]:
-		currHighSlope: float = self.getSlope(staticNode, movingNode)
-		highNode: LinkedListNode = movingNode
-		changed = False
-
-		if clockwise:
-			while True:
-				nextNode: LinkedListNode = movingNode.getPointsTo()
-				nextNodeSlope = self.getSlope(staticNode, nextNode)
-				if nextNodeSlope > currHighSlope:
-					currHighSlope = nextNodeSlope
-					highNode = nextNode
-					changed = True
-					nextNode = nextNode.getPointsTo()
-				else:
-					break
-		else:
-			while True:
-				nextNode: LinkedListNode = movingNode.getPointsFrom()
-				nextNodeSlope = self.getSlope(staticNode, nextNode)
-				if nextNodeSlope > currHighSlope:
-					currHighSlope = nextNodeSlope
-					highNode = nextNode
-					changed = True
-					nextNode = nextNode.getPointsFrom()
-				else:
-					break
-			
-		return highNode, changed
-
-	def getSlope(self, nodeOne: LinkedListNode, nodeTwo: LinkedListNode) -> float:
-		rise = nodeOne.getYCoordinate() - nodeTwo.getYCoordinate()
-		run = nodeOne.getXCoordinate() - nodeTwo.getXCoordinate()
-
-		return rise/run
-
-	# Called by GUI to compute Hull
-	def compute_hull(self, points: List[QPointF], pause, view):
+	# Called by GUI to compute Hull. With pause set the recursion is replayed after the solve, finished is
+	# called once the final hull is on screen.
+	def compute_hull(self, points: List[QPointF], pause, view, finished: Optional[Callable[[], None]] = None):
+		if self.player.isPlaying():
+			return # a replay is still drawing the last solve, its own finished callback is still to come
 		self.pause = pause
 		self.view = view
 		assert( type(points) == list and type(points[0]) == QPointF )
 
+		if pause: # the recursion can only be animated by the divide and conquer solver
+			self.computeDivideAndConquerHull(points, finished)
+			return
+
 		t1 = time.time()
-		points = sorted(points, key=lambda coordinate: coordinate.x())
+		coordinates = self.pointsToArray(points)
 		t2 = time.time()
-		print('Time Elapsed (Sorting): {:3.3f} sec'.format(t2-t1))
+		print('Time Elapsed (Conversion): {:3.3f} sec'.format(t2-t1))
 
 		t3 = time.time()
-		convexHull: ConvexHull = self.cHullSolver(points)
+		hullIndices = hull_indices(coordinates)
 		t4 = time.time()
 
-		polygon: List[QLineF] = self.getPolygon(convexHull)
-		self.showHull(polygon, RED)
-		self.showText('Time Elapsed (Convex Hull): {:3.3f} sec'.format(t4-t3))
-		print('Time Elapsed (Convex Hull): {:3.3f} sec'.format(t4-t3))
+		self.hullQuery = HullQuery.fromIndices(coordinates, hullIndices)
+		polygon: List[QLineF] = self.getPolygonFromIndices(points, hullIndices)
+		self.showSolution(polygon, t4-t3, finished)
 
+	def computeDivideAndConquerHull(self, points: List[QPointF], finished: Optional[Callable[[], None]] = None):
+		t1 = time.time()
+		coordinates = self.pointsToArray(points)
+		xs, ys = np.ascontiguousarray(coordinates[:, 0]), np.ascontiguousarray(coordinates[:, 1])
+		t2 = time.time()
+		print('Time Elapsed (Conversion): {:3.3f} sec'.format(t2-t1))
 
-	def getPolygon(self, convexHull: ConvexHull) -> List[QLineF]:
-		hull: List[QLineF] = []
+		t1 = time.time()
+		candidates = akl_toussaint_filter(xs, ys, PREFILTER_DIRECTIONS) # the recursion only sees points that can be on the hull
+		t2 = time.time()
+		print('Time Elapsed (Prefilter): {:3.3f} sec, {} of {} points discarded'.format(t2-t1, len(points) - len(candidates), len(points)))
 
-		firstNode: LinkedListNode = convexHull.getLeftNode()
-		hull.append(QLineF(firstNode.getCoordinates(), firstNode.getPointsTo().getCoordinates()))
-		nextNode: LinkedListNode = firstNode.getPointsTo()
+		t1 = time.time()
+		order = candidates[presort_order(xs[candidates], ys[candidates])]
+		t2 = time.time()
+		print('Time Elapsed (Sorting): {:3.3f} sec'.format(t2-t1))
 
-		while nextNode != firstNode:
-			hull.append(QLineF(nextNode.getCoordinates(), nextNode.getPointsTo().getCoordinates()))
-			nextNode = nextNode.getPointsTo()
+		t3 = time.time()
+		recorder = RecordingObserver() if self.pause else None
+		# memoryviews hand the solver plain floats and ints without building lists
+		convexHull: ArrayHull = DivideAndConquerSolver(recorder).solveCoordinates(memoryview(xs), memoryview(ys), memoryview(order), points)
+		t4 = time.time()
 
-		return hull
+		self.hullQuery = HullQuery.fromHull(convexHull)
+		polygon: List[QLineF] = self.getPolygon(convexHull)
+		if recorder is None:
+			self.showSolution(polygon, t4-t3, finished)
+		else: # the elapsed time is the solve alone, the replay runs afterwards
+			self.player.play(recorder.events, PAUSE, lambda: self.showSolution(polygon, t4-t3, finished))
+
+	def showSolution(self, polygon: List[QLineF], elapsed: float, finished: Optional[Callable[[], None]] = None):
+		self.showHull(polygon, RED)
+		self.showText('Time Elapsed (Convex Hull): {:3.3f} sec'.format(elapsed))
+		print('Time Elapsed (Convex Hull): {:3.3f} sec'.format(elapsed))
+		if finished is not None:
+			finished()
+
+	def pointsToArray(self, points: List[QPointF]) -> np.ndarray:
+		# One pass over the QPointF list, everything after this works on the (n, 2) array
+		coordinates = np.fromiter((value for point in points for value in (point.x(), point.y())), dtype=np.float64, count=2*len(points))
+		return coordinates.reshape(-1, 2)
+
+	def getPolygonFromIndices(self, points: List[QPointF], hullIndices: np.ndarray) -> List[QLineF]:
+		hullPoints: List[QPointF] = [points[index] for index in hullIndices.tolist()]
+		return [QLineF(hullPoints[i-1], hullPoints[i]) for i in range(1, len(hullPoints))] + [QLineF(hullPoints[-1], hullPoints[0])]
+
+	def getPolygon(self, convexHull: ArrayHull) -> List[QLineF]:
+		return [QLineF(pointOne, pointTwo) for pointOne, pointTwo in hullSegments(convexHull)]
@@ -0,0 +1,12 @@
+# Qt-free convex hull core. Nothing imported here pulls in Qt or NumPy, so a
+# headless worker can load the divide and conquer solver cheaply. The NumPy
+# modules are imported on demand: geometry.hull_engine, geometry.parallel,
+# geometry.presort, geometry.interior_filter and geometry.query.
+
+from geometry.point import Point
+from geometry.linked_list import LinkedListNode
+from geometry.convex_hull import ConvexHull
+from geometry.array_hull import ArrayHull
+from geometry.divide_conquer import DivideAndConquerSolver, RecordingObserver, SolverObserver, hullSegments, replayEvent
+from geometry.incremental import IncrementalHull
+from geometry.predicates import orientation
@@ -0,0 +1,81 @@
+from array import array
+
+from geometry.point import Point
+
+# Flat storage for the divide and conquer solver. Instead of one LinkedListNode
+# per point, every point is a slot in a few shared arrays: its coordinates, the
+# slots it points to and from on its hull, and its position in the caller's
+# input. A hull in the middle of the recursion is just its (leftmost, rightmost)
+# slot pair, so a merge rewrites four ints and allocates nothing. That is 28 bytes
+# a point, where a node, its __dict__ and a QPointF came to several hundred.
+
+
+class ArrayHull:
+	__slots__ = ('xs', 'ys', 'pointsTo', 'pointsFrom', 'sourceIndices', 'points', 'leftIndex', 'rightIndex')
+
+	def __init__(self, xs: array, ys: array, sourceIndices: array, points: list = None):
+		self.xs = xs
+		self.ys = ys
+		self.sourceIndices = sourceIndices # slot -> position in the input, duplicates have no slot
+		self.points = points # the caller's point objects, if it passed any
+		self.pointsTo = array('i', range(len(xs))) # every slot starts out as its own one-point hull
+		self.pointsFrom = array('i', range(len(xs)))
+		self.leftIndex = 0
+		self.rightIndex = len(xs) - 1
+
+	@classmethod
+	def fromPoints(cls, points: list) -> 'ArrayHull':
+		return cls.fromCoordinates((point.x() for point in points), (point.y() for point in points), points=points)
+
+	@classmethod
+	def fromCoordinates(cls, xs, ys, order=None, points: list = None) -> 'ArrayHull':
+		# xs and ys must be sorted by (x, y), or order must be the permutation that sorts them;
+		# exact duplicates collapse into one slot
+		slotXs, slotYs, sourceIndices = array('d'), array('d'), array('i')
+		if order is None:
+			coordinates = enumerate(zip(xs, ys))
+		else:
+			coordinates = ((index, (xs[index], ys[index])) for index in order)
+		for index, (x, y) in coordinates:
+			if sourceIndices and x == slotXs[-1] and y == slotYs[-1]:
+				continue
+			slotXs.append(x)
+			slotYs.append(y)
+			sourceIndices.append(index)
+		return cls(slotXs, slotYs, sourceIndices, points)
+
+	def __len__(self) -> int:
+		return len(self.xs)
+
+	def getLeftIndex(self) -> int:
+		return self.leftIndex
+
+	def getRightIndex(self) -> int:
+		return self.rightIndex
+
+	def link(self, fromIndex: int, toIndex: int) -> None:
+		self.pointsTo[fromIndex] = toIndex
+		self.pointsFrom[toIndex] = fromIndex
+
+	def getPoint(self, index: int):
+		if self.points is not None:
+			return self.points[self.sourceIndices[index]]
+		return Point(self.xs[index], self.ys[index])
+
+	def walk(self, startIndex: int = None) -> list:
+		# Slots of the hull through startIndex, clockwise
+		startIndex = self.leftIndex if startIndex is None else startIndex
+		slots = [startIndex]
+		nextIndex = self.pointsTo[startIndex]
+		while nextIndex != startIndex:
+			slots.append(nextIndex)
+			nextIndex = self.pointsTo[nextIndex]
+		return slots
+
+	def indices(self) -> list:
+		# Input positions of the hull vertices, clockwise from the leftmost
+		return [self.sourceIndices[index] for index in self.walk()]
+
+	def segments(self, startIndex: int = None) -> list:
+		slots = self.walk(startIndex)
+		return [(self.getPoint(slots[i-1]), self.getPoint(slots[i])) for i in range(1, len(slots))] + [(self.getPoint(slots[-1]), self.getPoint(slots[0]))]
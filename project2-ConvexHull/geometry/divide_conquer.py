@@ -0,0 +1,229 @@
+from typing import Optional, Union
+
+from geometry.array_hull import ArrayHull
+from geometry.convex_hull import ConvexHull
+from geometry.linked_list import LinkedListNode
+from geometry.predicates import CLOCKWISE, COLLINEAR, COUNTERCLOCKWISE, orientation
+
+# Divide and conquer convex hull, free of any GUI code. Points are anything with
+# x() and y() accessors and must arrive sorted by (x, y), or come as coordinates
+# with the permutation that sorts them to solveCoordinates(). Exact duplicates
+# are dropped, and repeated x values are fine. The points are copied once into an
+# ArrayHull and the recursion works on slot ranges of it: a hull is the pair of
+# its leftmost and rightmost slots, its clockwise cycle lives in the shared
+# pointsTo/pointsFrom arrays, and merges start the tangent search from the
+# facing sides.
+#
+# An observer can be attached to watch the recursion. It receives segments as
+# (point, point) pairs of the original point objects, so a GUI can map them back
+# to whatever line type it draws.
+
+
+class SolverObserver:
+	# Default observer, ignores every event
+	def showTangent(self, segments: list) -> None:
+		pass
+
+	def eraseTangent(self, segments: list) -> None:
+		pass
+
+	def showHull(self, segments: list) -> None:
+		pass
+
+	def eraseHull(self, segments: list) -> None:
+		pass
+
+
+# Event kinds recorded by RecordingObserver, in the order of SolverObserver's methods
+SHOW_TANGENT, ERASE_TANGENT, SHOW_HULL, ERASE_HULL = range(4)
+EVENT_METHODS = ('showTangent', 'eraseTangent', 'showHull', 'eraseHull')
+
+
+class RecordingObserver(SolverObserver):
+	# Buffers every event as a (kind, segments) pair instead of acting on it, so the solver never
+	# waits on a display. The buffer can be replayed later, at any speed, with replayEvent.
+	def __init__(self):
+		self.events = []
+
+	def showTangent(self, segments: list) -> None:
+		self.events.append((SHOW_TANGENT, segments))
+
+	def eraseTangent(self, segments: list) -> None:
+		self.events.append((ERASE_TANGENT, segments))
+
+	def showHull(self, segments: list) -> None:
+		self.events.append((SHOW_HULL, segments))
+
+	def eraseHull(self, segments: list) -> None:
+		self.events.append((ERASE_HULL, segments))
+
+
+def replayEvent(event: tuple, observer: SolverObserver) -> None:
+	kind, segments = event
+	getattr(observer, EVENT_METHODS[kind])(segments)
+
+
+class DivideAndConquerSolver:
+
+	def __init__(self, observer: Optional[SolverObserver] = None):
+		self.observer = observer
+
+	def solve(self, points: list) -> ArrayHull:
+		if not points:
+			raise ValueError('A hull needs at least one point')
+		return self.solveHull(ArrayHull.fromPoints(points))
+
+	def solveCoordinates(self, xs, ys, order=None, points: list = None) -> ArrayHull:
+		# Same as solve() for two coordinate sequences, which may come in any order if order is the
+		# permutation that sorts them (see geometry.presort). No point objects are created; if points
+		# is given, segments and observer events refer to its entries.
+		hull: ArrayHull = ArrayHull.fromCoordinates(xs, ys, order, points)
+		if not len(hull):
+			raise ValueError('A hull needs at least one point')
+		return self.solveHull(hull)
+
+	def solveHull(self, hull: ArrayHull) -> ArrayHull:
+		hull.leftIndex, hull.rightIndex = self.cHullSolver(hull, 0, len(hull))
+		return hull
+
+	def cHullSolver(self, hull: ArrayHull, low: int, high: int) -> tuple[int, int]:
+		if high - low <= 3:
+			return self.createSmallHull(hull, low, high)
+		else:
+			middle = (low + high) // 2
+			leftHull = self.cHullSolver(hull, low, middle)
+			rightHull = self.cHullSolver(hull, middle, high)
+			return self.mergeHulls(hull, leftHull, rightHull)
+
+	# this is the smallest hull with only 1-3 points
+	def createSmallHull(self, hull: ArrayHull, low: int, high: int) -> tuple[int, int]:
+		if high - low == 1: # only reachable when the whole input is one point, the slot already links to itself
+			return low, low
+		elif high - low == 2:
+			return self.twoPointsToHull(hull, low)
+		else:
+			return self.threePointsToHull(hull, low)
+
+	def twoPointsToHull(self, hull: ArrayHull, low: int) -> tuple[int, int]:
+		hull.link(low, low + 1)
+		hull.link(low + 1, low)
+		return low, low + 1
+
+	def threePointsToHull(self, hull: ArrayHull, low: int) -> tuple[int, int]:
+		left, middle, right = low, low + 1, low + 2
+		turn = self.getOrientation(hull, left, middle, right)
+		if turn == COLLINEAR: # the middle point sits on the segment between the other two
+			hull.link(left, right)
+			hull.link(right, left)
+		elif turn == CLOCKWISE:
+			hull.link(left, middle)
+			hull.link(middle, right)
+			hull.link(right, left)
+		else:
+			hull.link(left, right)
+			hull.link(right, middle)
+			hull.link(middle, left)
+		return left, right
+
+	def getOrientation(self, hull: ArrayHull, indexOne: int, indexTwo: int, indexThree: int) -> int:
+		xs, ys = hull.xs, hull.ys
+		return orientation(xs[indexOne], ys[indexOne], xs[indexTwo], ys[indexTwo], xs[indexThree], ys[indexThree])
+
+	def isClockwise(self, hull: ArrayHull, indexOne: int, indexTwo: int, indexThree: int) -> bool:
+		return self.getOrientation(hull, indexOne, indexTwo, indexThree) == CLOCKWISE
+
+	def isFarther(self, hull: ArrayHull, staticIndex: int, movingIndex: int, candidateIndex: int) -> bool:
+		# For a candidate collinear with static and moving, on the same side of static: is it the farther one?
+		# Along such a ray the (x, y) order runs away from static, so exact tuple comparisons decide it.
+		xs, ys = hull.xs, hull.ys
+		static = (xs[staticIndex], ys[staticIndex])
+		moving = (xs[movingIndex], ys[movingIndex])
+		candidate = (xs[candidateIndex], ys[candidateIndex])
+		return candidate < moving if moving < static else candidate > moving
+
+	def mergeHulls(self, hull: ArrayHull, leftHull: tuple[int, int], rightHull: tuple[int, int]) -> tuple[int, int]:
+		leftHullTopIndex, rightHullTopIndex = self.getTopTangent(hull, leftHull, rightHull)
+		rightHullBottomIndex, leftHullBottomIndex = self.getLowerTangent(hull, leftHull, rightHull)
+		if self.observer is not None:
+			self.reportMerge(hull, leftHull, rightHull, [(leftHullTopIndex, rightHullTopIndex), (rightHullBottomIndex, leftHullBottomIndex)])
+		hull.link(leftHullTopIndex, rightHullTopIndex)
+		hull.link(rightHullBottomIndex, leftHullBottomIndex)
+		return leftHull[0], rightHull[1]
+
+	def reportMerge(self, hull: ArrayHull, leftHull: tuple[int, int], rightHull: tuple[int, int], tangents: list) -> None:
+		leftSegments, rightSegments = hull.segments(leftHull[0]), hull.segments(rightHull[0])
+		tangentSegments = [(hull.getPoint(indexOne), hull.getPoint(indexTwo)) for indexOne, indexTwo in tangents]
+		self.observer.showHull(leftSegments)
+		self.observer.showHull(rightSegments)
+		self.observer.showTangent(tangentSegments)
+		self.observer.eraseTangent(tangentSegments)
+		self.observer.eraseHull(leftSegments)
+		self.observer.eraseHull(rightSegments)
+
+	def getTopTangent(self, hull: ArrayHull, leftHull: tuple[int, int], rightHull: tuple[int, int]) -> tuple[int, int]:
+		currLeftTopIndex: int = leftHull[1]
+		currRightTopIndex: int = rightHull[0]
+
+		changed = True
+		while changed:
+			currLeftTopIndex, negChanged = self.getMostNegativeSlope(hull, currRightTopIndex, currLeftTopIndex, False)
+			currRightTopIndex, posChanged = self.getMostPositiveSlope(hull, currLeftTopIndex, currRightTopIndex, True)
+			changed = negChanged or posChanged
+
+		return currLeftTopIndex, currRightTopIndex
+
+	def getLowerTangent(self, hull: ArrayHull, leftHull: tuple[int, int], rightHull: tuple[int, int]) -> tuple[int, int]:
+		currLeftLowerIndex: int = leftHull[1]
+		currRightLowerIndex: int = rightHull[0]
+
+		changed = True
+		while changed:
+			currLeftLowerIndex, posChanged = self.getMostPositiveSlope(hull, currRightLowerIndex, currLeftLowerIndex, True)
+			currRightLowerIndex, negChanged = self.getMostNegativeSlope(hull, currLeftLowerIndex, currRightLowerIndex, False)
+			changed = negChanged or posChanged
+
+		return currRightLowerIndex, currLeftLowerIndex
+
+	# The two walks below rotate the line through staticIndex. Every slot of the moving hull lies on one
+	# side of staticIndex in (x, y) order, so "the slope decreases" is exactly "the candidate is clockwise
+	# of the current slot as seen from staticIndex", and no division is needed. A collinear candidate is
+	# taken when it is farther out, so collinear points never end up as tangent endpoints.
+
+	def getMostNegativeSlope(self, hull: ArrayHull, staticIndex: int, movingIndex: int, clockwise: bool) -> tuple[int, bool]:
+		return self.rotateTangent(hull, staticIndex, movingIndex, clockwise, CLOCKWISE)
+
+	def getMostPositiveSlope(self, hull: ArrayHull, staticIndex: int, movingIndex: int, clockwise: bool) -> tuple[int, bool]:
+		return self.rotateTangent(hull, staticIndex, movingIndex, clockwise, COUNTERCLOCKWISE)
+
+	def rotateTangent(self, hull: ArrayHull, staticIndex: int, movingIndex: int, clockwise: bool, turn: int) -> tuple[int, bool]:
+		links = hull.pointsTo if clockwise else hull.pointsFrom
+		xs, ys = hull.xs, hull.ys
+		staticX, staticY = xs[staticIndex], ys[staticIndex]
+		changed = False
+		while True:
+			nextIndex = links[movingIndex]
+			if nextIndex == movingIndex:
+				break
+			nextTurn = orientation(staticX, staticY, xs[movingIndex], ys[movingIndex], xs[nextIndex], ys[nextIndex])
+			if nextTurn == turn or (nextTurn == COLLINEAR and self.isFarther(hull, staticIndex, movingIndex, nextIndex)):
+				movingIndex = nextIndex
+				changed = True
+			else:
+				break
+		return movingIndex, changed
+
+
+def hullSegments(convexHull: Union[ArrayHull, ConvexHull]) -> list:
+	# Edges of the hull as (point, point) pairs, clockwise from the leftmost vertex
+	if isinstance(convexHull, ArrayHull):
+		return convexHull.segments()
+	segments = []
+	firstNode: LinkedListNode = convexHull.getLeftNode()
+	segments.append((firstNode.getCoordinates(), firstNode.getPointsTo().getCoordinates()))
+	nextNode: LinkedListNode = firstNode.getPointsTo()
+
+	while nextNode != firstNode:
+		segments.append((nextNode.getCoordinates(), nextNode.getPointsTo().getCoordinates()))
+		nextNode = nextNode.getPointsTo()
+
+	return segments
@@ -0,0 +1,175 @@
+import numpy as np
+
+from geometry.predicates import CCW_ERROR_BOUND, CLOCKWISE, COUNTERCLOCKWISE, orientation
+
+# Vectorized convex hull over an (n, 2) float64 array. Every orientation test in
+# a step runs as one NumPy expression over all of the points still in play, so
+# nothing is done per point in Python beyond the rare near-collinear triple.
+#
+#   1. Interior filter: the points extreme in x, y, x+y and x-y span a polygon,
+#      and anything strictly inside it cannot be on the hull.
+#   2. Quickhull on the survivors: split by the line through the leftmost and
+#      rightmost points, then repeatedly take the point farthest from each edge
+#      and drop everything inside the new triangle.
+#
+# Which side of an edge a point is on is decided with the exact orientation from
+# geometry.predicates, vectorized over its float fast path, and each split hands
+# a point to one side only. Float cross products of a -> b and b -> a are not
+# exact negatives, so a nearly collinear point could otherwise count as left of
+# both and come back twice. The farthest point is still picked by float distance;
+# on nearly collinear input that can be the wrong one, and the chain comes out
+# with a turn that is not clockwise. Quickhull never drops a true vertex, so
+# that case is repaired with a monotone chain pass over the few vertices found.
+#
+# Hull vertices come back as indices into the input, clockwise from the
+# leftmost point like the linked list hulls in convex_hull.py. Collinear
+# boundary points are left out.
+
+
+def cross(ox, oy, ax, ay, bx, by):
+	# > 0 when o -> a -> b turns counterclockwise, < 0 when it turns clockwise
+	return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+def extremeIndices(xs, ys, directions=8):
+	# Clockwise from the leftmost point: the extremes in -x, +y, +x, -y and, with 8 directions, the four diagonals.
+	# Ties go to the point that comes last in clockwise order, so the polygon never doubles back.
+	if directions not in (4, 8):
+		raise ValueError('extremeIndices takes 4 or 8 directions, got {}'.format(directions))
+	total, difference = xs + ys, xs - ys
+	# (values, maximize?, tie-break values, maximize tie-break?) per direction
+	table = [
+		(xs, False, ys, True), (difference, False, total, True), (ys, True, xs, True), (total, True, difference, True),
+		(xs, True, ys, False), (difference, True, total, False), (ys, False, xs, False), (total, False, difference, False),
+	]
+	extremes = []
+	for values, maximize, tieBreak, maximizeTie in table[::8 // directions]:
+		best = np.flatnonzero(values == (values.max() if maximize else values.min()))
+		ties = tieBreak[best]
+		index = int(best[np.argmax(ties) if maximizeTie else np.argmin(ties)])
+		if index not in extremes:
+			extremes.append(index)
+	return extremes
+
+def interiorMask(xs, ys, polygon):
+	# True for points strictly inside the clockwise polygon given as an index list
+	inside = np.ones(xs.shape, dtype=np.bool_)
+	if len(polygon) < 3:
+		return ~inside
+	side = np.empty(xs.shape, dtype=np.float64)
+	for start, end in zip(polygon, polygon[1:] + polygon[:1]):
+		# cross(start, end, p) written as dx*y - dy*x + c, strictly negative right of a clockwise edge
+		dx, dy = xs[end] - xs[start], ys[end] - ys[start]
+		np.multiply(ys, dx, out=side)
+		side -= dy * xs
+		side += dy * xs[start] - dx * ys[start]
+		inside &= side < 0
+	return inside
+
+def orientations(ax, ay, bx, by, cx, cy):
+	# predicates.orientation over broadcast arrays, as int8. Same float fast path, vectorized;
+	# only the triples inside its error bound go through orientation one by one.
+	detLeft = (ax - cx) * (by - cy)
+	detRight = (ay - cy) * (bx - cx)
+	det = detLeft - detRight
+	side = np.sign(det).astype(np.int8)
+	uncertain = np.abs(det) <= CCW_ERROR_BOUND * (np.abs(detLeft) + np.abs(detRight))
+	if not uncertain.any():
+		return side
+	uncertain &= ~(((ax == cx) | (by == cy)) & ((ay == cy) | (bx == cx))) # both products exactly zero, e.g. a point on its own edge
+	uncertain = np.flatnonzero(uncertain)
+	if uncertain.size:
+		coordinates = [np.broadcast_to(values, side.shape)[uncertain].tolist() for values in (ax, ay, bx, by, cx, cy)]
+		side[uncertain] = [orientation(*triple) for triple in zip(*coordinates)]
+	return side
+
+def strictlyConvex(xs, ys, hull):
+	# True when every vertex of the clockwise index cycle turns clockwise
+	before, after = np.roll(hull, 1), np.roll(hull, -1)
+	return bool(np.all(orientations(xs[before], ys[before], xs[hull], ys[hull], xs[after], ys[after]) == CLOCKWISE))
+
+def monotoneChain(xs, ys, vertices):
+	# Exact hull of a few vertices, clockwise from the leftmost; the fallback when quickhull's float distances
+	# picked a wrong farthest point, which happens on nearly collinear input
+	ordered = sorted(vertices.tolist(), key=lambda index: (xs[index], ys[index]))
+	chains = []
+	for sweep in (ordered, ordered[::-1]): # upper chain left to right, then lower chain right to left
+		chain = []
+		for index in sweep:
+			while len(chain) >= 2 and orientation(xs[chain[-2]], ys[chain[-2]], xs[chain[-1]], ys[chain[-1]], xs[index], ys[index]) != CLOCKWISE:
+				chain.pop()
+			chain.append(index)
+		chains.append(chain)
+	upper, lower = chains
+	return upper + lower[1:-1]
+
+def quickhull(xs, ys, candidates, start, end):
+	# Hull vertices among candidates, which must all be strictly left of start -> end, in order from start to end.
+	# Each pending edge carries its own coordinate arrays so a step only compresses small arrays.
+	chain = []
+	stack = [('edge', start, end, candidates, xs[candidates], ys[candidates])]
+	while stack:
+		item = stack.pop()
+		if item[0] == 'vertex':
+			chain.append(item[1])
+			continue
+		_, a, b, indices, px, py = item
+		if indices.size <= 1:
+			chain.extend(indices.tolist()) # a lone candidate left of the edge is a vertex, nothing to split
+			continue
+		distance = cross(xs[a], ys[a], xs[b], ys[b], px, py)
+		farthest = np.flatnonzero(distance == distance.max())
+		# several points can share the farthest parallel line, only its two ends are hull vertices
+		along = (px[farthest] - xs[a]) * (xs[b] - xs[a]) + (py[farthest] - ys[a]) * (ys[b] - ys[a])
+		far = int(indices[farthest[np.argmin(along)]])
+		towardFar = orientations(xs[a], ys[a], xs[far], ys[far], px, py) == COUNTERCLOCKWISE
+		pastFar = (orientations(xs[far], ys[far], xs[b], ys[b], px, py) == COUNTERCLOCKWISE) & ~towardFar # a point goes down one side at most
+		# pushed in reverse so the chain comes out in order: (a, far), far, (far, b)
+		stack.append(('edge', far, b, indices[pastFar], px[pastFar], py[pastFar]))
+		stack.append(('vertex', far))
+		stack.append(('edge', a, far, indices[towardFar], px[towardFar], py[towardFar]))
+	return chain
+
+def hull_indices(points, prefilter=True):
+	points = np.asarray(points, dtype=np.float64)
+	if points.ndim != 2 or points.shape[1] != 2:
+		raise ValueError('hull_indices expects an (n, 2) array, got shape {}'.format(points.shape))
+	if len(points) == 0:
+		return np.empty(0, dtype=np.intp)
+	xs, ys = np.ascontiguousarray(points[:, 0]), np.ascontiguousarray(points[:, 1])
+
+	candidates = np.arange(len(points))
+	if prefilter and len(points) > 8:
+		candidates = candidates[~interiorMask(xs, ys, extremeIndices(xs, ys))]
+
+	cx, cy = xs[candidates], ys[candidates]
+	leftmost = int(candidates[np.lexsort((cy, cx))[0]])
+	rightmost = int(candidates[np.lexsort((-cy, -cx))[0]])
+	if xs[leftmost] == xs[rightmost] and ys[leftmost] == ys[rightmost]:
+		return np.array([leftmost], dtype=np.intp)
+
+	# Points above the split line are left of leftmost -> rightmost, points below are left of the reverse
+	side = orientations(xs[leftmost], ys[leftmost], xs[rightmost], ys[rightmost], cx, cy)
+	upper = quickhull(xs, ys, candidates[side == COUNTERCLOCKWISE], leftmost, rightmost)
+	lower = quickhull(xs, ys, candidates[side == CLOCKWISE], rightmost, leftmost)
+	hull = np.array([leftmost] + upper + [rightmost] + lower, dtype=np.intp)
+	if len(hull) > 2 and not strictlyConvex(xs, ys, hull):
+		# every hull vertex is still in the list, since a point is only dropped once it is exactly inside a triangle
+		hull = np.array(monotoneChain(xs, ys, hull), dtype=np.intp)
+	return hull
+
+
+if __name__ == '__main__': # python -m geometry.hull_engine
+	# Nearly collinear points on y = 0.1x; float cross products used to put index 3 in both chains
+	nearlyCollinear = [[0.1700346492992758, 0.017003464929927582], [0.6492195093866816, 0.06492195093866816],
+		[0.8267462355881423, 0.08267462355881423], [0.3689994268987544, 0.036899942689875447]]
+	hull = hull_indices(nearlyCollinear)
+	assert len(set(hull.tolist())) == len(hull), 'repeated hull vertex: {}'.format(hull)
+	assert strictlyConvex(*np.asarray(nearlyCollinear).T, hull), 'hull is not strictly convex: {}'.format(hull)
+
+	rng = np.random.default_rng(0)
+	for trial in range(500):
+		xs = rng.random(int(rng.integers(3, 40)))
+		points = np.stack([xs, 0.1 * xs], axis=1)
+		hull = hull_indices(points, prefilter=bool(trial % 2))
+		assert len(hull) <= 2 or strictlyConvex(points[:, 0], points[:, 1], hull), 'trial {}: {}'.format(trial, hull)
+	print('Done! All tests passed.')
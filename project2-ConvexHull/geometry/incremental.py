@@ -0,0 +1,234 @@
+import importlib.util
+from bisect import bisect_left, insort
+
+from geometry.predicates import CLOCKWISE, COUNTERCLOCKWISE, orientation
+
+# Convex hull that grows one point at a time, for feeds where rebuilding the
+# whole hull on every update is too slow. The hull is kept as its two monotone
+# chains, both running left to right in (x, y) order and sharing their end
+# points: the upper chain turns clockwise at every vertex, the lower chain
+# counterclockwise. Collinear points are never kept.
+#
+# A new point is located in each chain by bisection. If it is on the inner side
+# of the edge it falls under, that chain is untouched, so an interior point
+# costs a few bisections and two orientation tests. Otherwise it goes in and
+# neighbours that stopped being convex are popped on each side; a point is
+# popped at most once, so insertion is amortized O(log n).
+#
+# The chains are sortedcontainers.SortedList when that package is installed,
+# otherwise _BlockedChain below, a cut-down version of the same layout: sorted
+# blocks of a few hundred keys, a list of each block's largest key to bisect
+# into, and a Fenwick tree of block lengths for positional access. Inserts,
+# pops and lookups by position are O(log n) plus a shift inside one block.
+
+BLOCK_LOAD = 512 # a block is split in two once it holds twice this many keys
+
+
+class _BlockedChain:
+
+	def __init__(self):
+		self._blocks = [] # sorted lists of keys, every key in one block below every key in the next
+		self._maxes = [] # last key of each block
+		self._tree = None # Fenwick tree over the block lengths, rebuilt when blocks are split or removed
+		self._length = 0
+
+	def __len__(self) -> int:
+		return self._length
+
+	def __iter__(self):
+		for block in self._blocks:
+			yield from block
+
+	def __reversed__(self):
+		for block in reversed(self._blocks):
+			yield from reversed(block)
+
+	def __getitem__(self, index: int):
+		block, offset = self._locate(index)
+		return self._blocks[block][offset]
+
+	def add(self, value) -> None:
+		if not self._blocks:
+			self._blocks.append([value])
+			self._maxes.append(value)
+			self._length = 1
+			return
+		block = min(bisect_left(self._maxes, value), len(self._blocks) - 1)
+		keys = self._blocks[block]
+		insort(keys, value)
+		self._maxes[block] = keys[-1]
+		self._length += 1
+		if len(keys) > 2 * BLOCK_LOAD:
+			self._blocks[block:block+1] = [keys[:BLOCK_LOAD], keys[BLOCK_LOAD:]]
+			self._maxes[block:block+1] = [keys[BLOCK_LOAD-1], keys[-1]]
+			self._tree = None
+		else:
+			self._grow(block, 1)
+
+	def pop(self, index: int = -1):
+		block, offset = self._locate(index)
+		keys = self._blocks[block]
+		value = keys.pop(offset)
+		self._length -= 1
+		if keys:
+			self._maxes[block] = keys[-1]
+			self._grow(block, -1)
+		else:
+			del self._blocks[block], self._maxes[block]
+			self._tree = None
+		return value
+
+	def bisect_left(self, value) -> int:
+		block = bisect_left(self._maxes, value)
+		if block == len(self._blocks):
+			return self._length
+		return self._offset(block) + bisect_left(self._blocks[block], value)
+
+	def _buildTree(self) -> list:
+		# O(number of blocks), once per split or removal
+		tree = [0] + [len(keys) for keys in self._blocks]
+		for node in range(1, len(tree)):
+			parent = node + (node & -node)
+			if parent < len(tree):
+				tree[parent] += tree[node]
+		self._tree = tree
+		return tree
+
+	def _grow(self, block: int, change: int) -> None:
+		tree = self._tree
+		if tree is None:
+			return # rebuilt from the blocks on the next lookup
+		node = block + 1
+		while node < len(tree):
+			tree[node] += change
+			node += node & -node
+
+	def _offset(self, block: int) -> int:
+		# Number of keys in the blocks before this one
+		tree = self._tree or self._buildTree()
+		total = 0
+		while block:
+			total += tree[block]
+			block -= block & -block
+		return total
+
+	def _locate(self, index: int) -> tuple:
+		# (block, offset in the block) of a position, negative positions count from the end
+		if index < 0:
+			index += self._length
+		if not 0 <= index < self._length:
+			raise IndexError('chain index out of range')
+		tree = self._tree or self._buildTree()
+		block, step = 0, 1 << (len(tree) - 1).bit_length()
+		while step:
+			if block + step < len(tree) and tree[block + step] <= index:
+				block += step
+				index -= tree[block]
+			step >>= 1
+		return block, index
+
+
+if importlib.util.find_spec('sortedcontainers') is not None:
+	from sortedcontainers import SortedList as _Chain
+else:
+	_Chain = _BlockedChain
+
+
+class IncrementalHull:
+
+	def __init__(self, points: list = ()):
+		self._upper = _Chain() # (x, y) tuples, each chain sorted and strictly convex
+		self._lower = _Chain()
+		self._points = {} # (x, y) -> the point object it came from, hull vertices only
+		for point in points:
+			self.insert(point)
+
+	def __len__(self) -> int:
+		# Number of hull vertices
+		return len(self._points)
+
+	def insert(self, point) -> bool:
+		# Adds a point with x() and y() accessors, returns whether the hull changed
+		key = (point.x(), point.y())
+		if key in self._points:
+			return False
+		if not self._points:
+			self._upper.add(key)
+			self._lower.add(key)
+			self._points[key] = point
+			return True
+		changed = self.insertIntoChain(self._upper, key, CLOCKWISE)
+		changed = self.insertIntoChain(self._lower, key, COUNTERCLOCKWISE) or changed
+		if changed:
+			self._points[key] = point
+		return changed
+
+	def insertIntoChain(self, chain: _Chain, key: tuple, turn: int) -> bool:
+		index = chain.bisect_left(key)
+		if 0 < index < len(chain):
+			left, right = chain[index-1], chain[index]
+			if orientation(left[0], left[1], key[0], key[1], right[0], right[1]) != turn:
+				return False # on or inside the edge it falls under
+		chain.add(key)
+		while index >= 2 and orientation(chain[index-2][0], chain[index-2][1], chain[index-1][0], chain[index-1][1], key[0], key[1]) != turn:
+			self.dropVertex(chain.pop(index-1))
+			index -= 1
+		while index + 2 < len(chain) and orientation(key[0], key[1], chain[index+1][0], chain[index+1][1], chain[index+2][0], chain[index+2][1]) != turn:
+			self.dropVertex(chain.pop(index+1))
+		return True
+
+	def dropVertex(self, key: tuple) -> None:
+		# Called once key has left a chain; an old end point can still be a vertex of the other one
+		if not (self.inChain(self._upper, key) or self.inChain(self._lower, key)):
+			del self._points[key]
+
+	def inChain(self, chain: _Chain, key: tuple) -> bool:
+		index = chain.bisect_left(key)
+		return index < len(chain) and chain[index] == key
+
+	def hull(self) -> list:
+		# Vertices clockwise from the leftmost, as the point objects that were inserted
+		if len(self._points) <= 2:
+			return [self._points[key] for key in self._upper]
+		keys = list(self._upper) + list(reversed(self._lower))[1:-1]
+		return [self._points[key] for key in keys]
+
+	def contains(self, point) -> bool:
+		# True for points inside the hull or on its boundary
+		if not self._points:
+			return False
+		key = (point.x(), point.y())
+		if key < self._upper[0] or key > self._upper[-1]:
+			return False
+		return self.underChain(self._upper, key, COUNTERCLOCKWISE) and self.underChain(self._lower, key, CLOCKWISE)
+
+	def underChain(self, chain: _Chain, key: tuple, outside: int) -> bool:
+		if self.inChain(chain, key):
+			return True
+		index = chain.bisect_left(key)
+		left, right = chain[index-1], chain[index]
+		return orientation(left[0], left[1], right[0], right[1], key[0], key[1]) != outside
+
+	def extreme(self, direction: tuple):
+		# The hull vertex maximizing dx*x + dy*y for direction (dx, dy)
+		dx, dy = direction
+		if not self._points:
+			raise ValueError('The hull is empty')
+		if dx == 0 and dy == 0:
+			raise ValueError('extreme needs a non-zero direction')
+		if dy == 0:
+			key = self._upper[-1] if dx > 0 else self._upper[0]
+		else:
+			# Along the chain facing the direction the edge vectors turn monotonically, so their
+			# projections go from positive to non-positive once; bisect for that change
+			chain = self._upper if dy > 0 else self._lower
+			low, high = 0, len(chain) - 1
+			while low < high:
+				middle = (low + high) // 2
+				here, after = chain[middle], chain[middle+1]
+				if dx * (after[0] - here[0]) + dy * (after[1] - here[1]) > 0:
+					low = middle + 1
+				else:
+					high = middle
+			key = chain[low]
+		return self._points[key]
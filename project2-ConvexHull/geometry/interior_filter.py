@@ -0,0 +1,37 @@
+import numpy as np
+
+from geometry.hull_engine import extremeIndices
+from geometry.predicates import CCW_ERROR_BOUND
+
+# Akl-Toussaint interior filter for the divide and conquer solver. The points
+# extreme in 4 or 8 directions are hull vertices and span a convex polygon;
+# anything strictly inside it cannot be on the hull, so only the rest need to go
+# through the recursion. For the GUI's oval and Gaussian sets that is a few
+# percent of the input.
+#
+# hull_engine.interiorMask makes the same cut for the NumPy engine, which can
+# afford a point near an edge landing on the wrong side. The solver works with
+# exact orientations, so here each edge test is the orientation determinant
+# with the fast-path error bound from geometry.predicates: a point is dropped
+# only when its float sign is certain, and anything closer to an edge survives.
+
+
+def strictInteriorMask(xs: np.ndarray, ys: np.ndarray, polygon: list) -> np.ndarray:
+	# True for points certainly strictly inside the clockwise polygon given as an index list
+	inside = np.ones(xs.shape, dtype=np.bool_)
+	if len(polygon) < 3:
+		return ~inside
+	for start, end in zip(polygon, polygon[1:] + polygon[:1]):
+		# orientation(start, end, p) as in predicates.orientation, vectorized over p; inside means clockwise
+		detLeft = (xs[start] - xs) * (ys[end] - ys)
+		detRight = (ys[start] - ys) * (xs[end] - xs)
+		errorBound = CCW_ERROR_BOUND * (np.abs(detLeft) + np.abs(detRight))
+		inside &= detRight - detLeft > errorBound
+	return inside
+
+def akl_toussaint_filter(xs, ys, directions: int = 8) -> np.ndarray:
+	# Ascending indices of the points that may be on the hull
+	xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+	if len(xs) <= directions:
+		return np.arange(len(xs))
+	return np.flatnonzero(~strictInteriorMask(xs, ys, extremeIndices(xs, ys, directions)))
@@ -0,0 +1,38 @@
+class LinkedListNode:
+	# coordinate is anything with x() and y() accessors (geometry.Point, QPointF, ...).
+	# The coordinates are read once here so the solver never calls back into the point object.
+	def __init__(self, coordinate, pointsTo: 'LinkedListNode', pointsFrom: 'LinkedListNode'):
+		self._pointsTo = pointsTo
+		self._pointsFrom = pointsFrom
+		self._coordinate = coordinate
+		self._x = coordinate.x()
+		self._y = coordinate.y()
+
+	def getCoordinates(self):
+		return self._coordinate
+	
+	def getXCoordinate(self) -> float:
+		return self._x
+	
+	def getYCoordinate(self) -> float:
+		return self._y
+	
+	def getPointsTo(self) -> 'LinkedListNode':
+		return self._pointsTo
+	
+	def getPointsFrom(self) -> 'LinkedListNode':
+		return self._pointsFrom
+	
+	def setPointFrom(self, node: 'LinkedListNode') -> None:
+		self._pointsFrom = node
+		node._setPointToPriv(self)
+	
+	def setPointTo(self, node: 'LinkedListNode') -> None:
+		self._pointsTo = node
+		node._setPointFromPriv(self)
+
+	def _setPointFromPriv(self, node: 'LinkedListNode') -> None:
+		self._pointsFrom = node
+	
+	def _setPointToPriv(self, node: 'LinkedListNode') -> None:
+		self._pointsTo = node
@@ -0,0 +1,93 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from geometry.array_hull import ArrayHull
+from geometry.divide_conquer import DivideAndConquerSolver
+from geometry.presort import presort_order
+
+# Divide and conquer hull spread over a process pool. The points are sorted by
+# (x, y) with geometry.presort and deduplicated once, then written to a shared
+# memory block as two float64 rows. Each worker attaches to the block, takes one
+# contiguous slot range and runs the ordinary solver on memoryviews of it, so no
+# coordinates are pickled on the way in and only hull vertices come back. Consecutive chunks are
+# separated in (x, y) order, so the parent merges the partial hulls pairwise
+# with the solver's own tangent walks, exactly as the recursion would have.
+
+MIN_CHUNK_POINTS = 1 << 14 # below this the pickling round trip costs more than the chunk
+
+
+def _chunkHull(name, count, low, high):
+	# Clockwise hull of slots [low, high) as global slots, and where the rightmost one sits in that list
+	block = shared_memory.SharedMemory(name=name)
+	try:
+		coordinates = block.buf.cast('d')
+		xs, ys = coordinates[low:high], coordinates[count + low:count + high]
+		hull: ArrayHull = DivideAndConquerSolver().solveHull(ArrayHull(xs, ys, range(low, high)))
+		slots = hull.walk()
+		result = [low + slot for slot in slots], slots.index(hull.getRightIndex())
+		del hull, xs, ys
+		coordinates.release()
+	finally:
+		block.close()
+	return result
+
+def parallel_hull_indices(points: np.ndarray, workers: int = None) -> np.ndarray:
+	# Same result as hull_engine.hull_indices: input indices of the hull, clockwise from the leftmost point
+	points = np.asarray(points, dtype=np.float64)
+	if len(points) == 0:
+		raise ValueError('A hull needs at least one point')
+	if workers is None:
+		workers = os.cpu_count() or 1
+
+	order = presort_order(points[:, 0], points[:, 1])
+	ordered = points[order]
+	keep = np.ones(len(ordered), dtype=bool)
+	keep[1:] = np.any(ordered[1:] != ordered[:-1], axis=1)
+	order, ordered = order[keep], ordered[keep]
+	count = len(ordered)
+
+	chunkCount = max(1, min(workers, count // MIN_CHUNK_POINTS))
+	bounds = [count * i // chunkCount for i in range(chunkCount + 1)]
+
+	block = shared_memory.SharedMemory(create=True, size=2 * count * 8)
+	try:
+		np.ndarray((2, count), dtype=np.float64, buffer=block.buf)[:] = ordered.T
+		chunkArgs = (repeat(block.name), repeat(count), bounds[:-1], bounds[1:])
+		if chunkCount == 1:
+			chunkHulls = list(map(_chunkHull, *chunkArgs))
+		else:
+			with ProcessPoolExecutor(max_workers=chunkCount) as executor:
+				chunkHulls = list(executor.map(_chunkHull, *chunkArgs))
+	finally:
+		block.close()
+		block.unlink()
+
+	return _mergeChunks(ordered, order, chunkHulls)
+
+def _mergeChunks(ordered: np.ndarray, order: np.ndarray, chunkHulls: list) -> np.ndarray:
+	# One ArrayHull over just the partial hull vertices, each chunk's cycle linked, then pairwise merges
+	slots = np.concatenate([np.asarray(chunkSlots, dtype=np.intp) for chunkSlots, _ in chunkHulls])
+	hull = ArrayHull(array('d', ordered[slots, 0]), array('d', ordered[slots, 1]), array('q', order[slots]))
+
+	hulls = []
+	start = 0
+	for chunkSlots, rightPosition in chunkHulls:
+		end = start + len(chunkSlots)
+		for slot in range(start, end):
+			hull.link(slot, slot + 1 if slot + 1 < end else start)
+		hulls.append((start, start + rightPosition))
+		start = end
+
+	solver = DivideAndConquerSolver()
+	while len(hulls) > 1:
+		merged = [solver.mergeHulls(hull, hulls[i], hulls[i+1]) for i in range(0, len(hulls) - 1, 2)]
+		if len(hulls) % 2:
+			merged.append(hulls[-1])
+		hulls = merged
+	hull.leftIndex, hull.rightIndex = hulls[0]
+	return np.asarray(hull.indices(), dtype=np.intp)
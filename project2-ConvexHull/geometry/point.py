@@ -0,0 +1,23 @@
+class Point:
+	# Plain 2-D point with the same x()/y() accessors as QPointF, so the solver
+	# can run on either without importing Qt
+	__slots__ = ('_x', '_y')
+
+	def __init__(self, x: float, y: float):
+		self._x = x
+		self._y = y
+
+	def x(self) -> float:
+		return self._x
+
+	def y(self) -> float:
+		return self._y
+
+	def __eq__(self, other) -> bool:
+		return isinstance(other, Point) and self._x == other._x and self._y == other._y
+
+	def __hash__(self) -> int:
+		return hash((self._x, self._y))
+
+	def __repr__(self) -> str:
+		return 'Point({!r}, {!r})'.format(self._x, self._y)
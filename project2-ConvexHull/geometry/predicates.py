@@ -0,0 +1,37 @@
+from fractions import Fraction
+
+# Orientation predicate for three points, exact for any finite float input.
+#
+# The fast path evaluates the 2x2 determinant in floating point and trusts its
+# sign whenever the magnitude clears Shewchuk's forward error bound for that
+# expression. Only near-collinear triples fail the check; those are re-evaluated
+# with Fractions, which represent every float exactly, so the sign is never wrong.
+# Unlike a slope, the determinant has no division, so vertical and repeated x
+# values need no special casing.
+
+EPSILON = 2.0 ** -53
+CCW_ERROR_BOUND = (3.0 + 16.0 * EPSILON) * EPSILON
+
+COUNTERCLOCKWISE = 1
+COLLINEAR = 0
+CLOCKWISE = -1
+
+
+def orientation(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> int:
+	# 1 when a -> b -> c turns counterclockwise, -1 when it turns clockwise, 0 when collinear
+	detLeft = (ax - cx) * (by - cy)
+	detRight = (ay - cy) * (bx - cx)
+	det = detLeft - detRight
+	errorBound = CCW_ERROR_BOUND * (abs(detLeft) + abs(detRight))
+	if det > errorBound:
+		return COUNTERCLOCKWISE
+	if -det > errorBound:
+		return CLOCKWISE
+	if (ax == cx or by == cy) and (ay == cy or bx == cx): # both products are exactly zero, common with repeated x
+		return COLLINEAR
+	return exactOrientation(ax, ay, bx, by, cx, cy)
+
+def exactOrientation(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> int:
+	ax, ay, bx, by, cx, cy = (Fraction(value) for value in (ax, ay, bx, by, cx, cy))
+	det = (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+	return (det > 0) - (det < 0)
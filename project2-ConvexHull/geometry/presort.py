@@ -0,0 +1,51 @@
+import numpy as np
+
+# Presort stage for the divide and conquer solver. The coordinates are pulled
+# out once as float64 arrays and sorted by (x, y) in NumPy; the solver gets the
+# resulting permutation and reads the points through it, so nothing is sorted
+# with a Python key function.
+#
+#   argsort  numpy.argsort on x alone; when two points share an x the y order
+#            matters too, and it falls back to lexsort
+#   lexsort  numpy.lexsort on (y, x), a comparison sort in C
+#   radix    LSD radix sort over the IEEE-754 bits, four 16-bit digits of y and
+#            then four of x, each pass a stable argsort of uint16 digits
+#
+# All three put the points in the same order. argsort is the default: with
+# distinct x values, as drawn by the GUI, it is several times faster than the
+# others. lexsort and radix keep equal points in input order. radix folds -0.0
+# into 0.0 first, so points that compare equal as floats also sort as equal.
+
+RADIX_BITS = 16
+SIGN_BIT = np.uint64(1 << 63)
+
+
+def sortableKeys(values: np.ndarray) -> np.ndarray:
+	# uint64 keys that order like the floats: flip every bit of negatives, only the sign bit of the rest
+	bits = (np.asarray(values, dtype=np.float64) + 0.0).view(np.uint64)
+	return np.where(bits & SIGN_BIT, ~bits, bits | SIGN_BIT)
+
+def radixOrder(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+	order = np.arange(len(xs))
+	mask = np.uint64((1 << RADIX_BITS) - 1)
+	for keys in (sortableKeys(ys), sortableKeys(xs)): # least significant key first
+		for shift in range(0, 64, RADIX_BITS):
+			digits = ((keys[order] >> np.uint64(shift)) & mask).astype(np.uint16)
+			if digits.min() != digits.max(): # a constant digit leaves the order as it is, common for low bits of round values
+				order = order[np.argsort(digits, kind='stable')]
+	return order
+
+def presort_order(xs, ys, method: str = 'argsort') -> np.ndarray:
+	# Permutation that puts the points in (x, y) order
+	xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+	if method == 'argsort':
+		order = np.argsort(xs)
+		sortedXs = xs[order]
+		if not np.any(sortedXs[1:] == sortedXs[:-1]):
+			return order
+		method = 'lexsort'
+	if method == 'lexsort':
+		return np.lexsort((ys, xs))
+	if method == 'radix':
+		return radixOrder(xs, ys)
+	raise ValueError('Unknown presort method: {}'.format(method))
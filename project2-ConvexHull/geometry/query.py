@@ -0,0 +1,196 @@
+import numpy as np
+
+from geometry.divide_conquer import hullSegments
+from geometry.hull_engine import cross
+from geometry.predicates import CLOCKWISE, COLLINEAR, COUNTERCLOCKWISE, orientation
+
+# Queries on a finished hull. The vertices are copied once into a contiguous
+# (h, 2) float64 array, clockwise from the leftmost vertex like every hull in
+# this package, and everything else works on that array.
+#
+#   contains          O(log h): bisect the fan of triangles around vertex 0, then
+#                     one edge test; exact, through geometry.predicates
+#   containsMany      the same bisection run on whole NumPy arrays of queries at
+#                     once, in plain float arithmetic
+#   diameter, width   rotating calipers, O(h)
+#   minimumAreaRectangle
+#                     rotating calipers with three pointers, O(h); the best
+#                     rectangle has a side on a hull edge (Freeman-Shapira)
+
+
+class HullQuery:
+
+	def __init__(self, vertices):
+		# vertices: (h, 2) hull vertices, clockwise from the leftmost, no collinear points
+		self.vertices = np.ascontiguousarray(vertices, dtype=np.float64).reshape(-1, 2)
+		if len(self.vertices) == 0:
+			raise ValueError('A hull needs at least one vertex')
+
+	@classmethod
+	def fromHull(cls, convexHull) -> 'HullQuery':
+		# From a solved ArrayHull or ConvexHull
+		return cls([(pointOne.x(), pointOne.y()) for pointOne, _ in hullSegments(convexHull)])
+
+	@classmethod
+	def fromIndices(cls, points, hullIndices) -> 'HullQuery':
+		# From an (n, 2) point array and the indices hull_engine.hull_indices returned for it
+		return cls(np.asarray(points, dtype=np.float64)[np.asarray(hullIndices)])
+
+	def __len__(self) -> int:
+		return len(self.vertices)
+
+	def area(self) -> float:
+		xs, ys = self.vertices[:, 0], self.vertices[:, 1]
+		return 0.5 * abs(float(np.dot(xs, np.roll(ys, -1)) - np.dot(ys, np.roll(xs, -1))))
+
+	# Containment
+
+	def contains(self, point) -> bool:
+		# True inside the hull or on its boundary; point has x() and y() accessors
+		return self.containsXY(point.x(), point.y())
+
+	def containsXY(self, x: float, y: float) -> bool:
+		vertices = self.vertices
+		count = len(vertices)
+		x0, y0 = vertices[0]
+		if count == 1:
+			return x == x0 and y == y0
+		if count == 2:
+			x1, y1 = vertices[1]
+			return orientation(x0, y0, x1, y1, x, y) == COLLINEAR and min(x0, x1) <= x <= max(x0, x1) and min(y0, y1) <= y <= max(y0, y1)
+
+		# Inside the fan at vertex 0 means clockwise of (or on) the ray to vertex 1 and
+		# counterclockwise of (or on) the ray to the last vertex
+		if orientation(x0, y0, vertices[1, 0], vertices[1, 1], x, y) == COUNTERCLOCKWISE:
+			return False
+		if orientation(x0, y0, vertices[-1, 0], vertices[-1, 1], x, y) == CLOCKWISE:
+			return False
+		low, high = 1, count - 2 # last vertex i whose ray has the point clockwise of it or on it
+		while low < high:
+			middle = (low + high + 1) // 2
+			if orientation(x0, y0, vertices[middle, 0], vertices[middle, 1], x, y) != COUNTERCLOCKWISE:
+				low = middle
+			else:
+				high = middle - 1
+		return orientation(vertices[low, 0], vertices[low, 1], vertices[low+1, 0], vertices[low+1, 1], x, y) != COUNTERCLOCKWISE
+
+	def containsMany(self, points) -> np.ndarray:
+		# Boolean mask over an (m, 2) array of query points. Float arithmetic, so points within
+		# rounding of an edge can go either way; use contains() where the boundary matters.
+		points = np.asarray(points, dtype=np.float64)
+		xs, ys = points[:, 0], points[:, 1]
+		vertices = self.vertices
+		count = len(vertices)
+		x0, y0 = vertices[0]
+		if count == 1:
+			return (xs == x0) & (ys == y0)
+		if count == 2:
+			x1, y1 = vertices[1]
+			return ((cross(x0, y0, x1, y1, xs, ys) == 0) & (xs >= min(x0, x1)) & (xs <= max(x0, x1))
+				& (ys >= min(y0, y1)) & (ys <= max(y0, y1)))
+
+		inside = (cross(x0, y0, vertices[1, 0], vertices[1, 1], xs, ys) <= 0) & (cross(x0, y0, vertices[-1, 0], vertices[-1, 1], xs, ys) >= 0)
+		low = np.ones(len(points), dtype=np.intp)
+		high = np.full(len(points), count - 2, dtype=np.intp)
+		for _ in range(int(count - 2).bit_length()): # every query bisects in lockstep
+			middle = (low + high + 1) // 2
+			clockwiseOf = cross(x0, y0, vertices[middle, 0], vertices[middle, 1], xs, ys) <= 0
+			low = np.where(clockwiseOf, middle, low)
+			high = np.where(clockwiseOf, high, middle - 1)
+		inside &= cross(vertices[low, 0], vertices[low, 1], vertices[low+1, 0], vertices[low+1, 1], xs, ys) <= 0
+		return inside
+
+	# Rotating calipers. They run counterclockwise over the reversed vertex array; the
+	# indices they return are converted back to positions in self.vertices.
+
+	def _counterclockwise(self) -> np.ndarray:
+		return self.vertices[::-1]
+
+	def _position(self, index: int) -> int:
+		return len(self.vertices) - 1 - index
+
+	def _antipodal(self, vertices, i: int, j: int) -> int:
+		# Advances j to the vertex farthest from edge i -> i+1
+		count = len(vertices)
+		(ax, ay), (bx, by) = vertices[i], vertices[(i+1) % count]
+		for _ in range(count):
+			nx, ny = vertices[(j+1) % count]
+			if cross(ax, ay, bx, by, nx, ny) > cross(ax, ay, bx, by, vertices[j, 0], vertices[j, 1]):
+				j = (j + 1) % count
+			else:
+				break
+		return j
+
+	def diameter(self) -> tuple:
+		# (largest distance between two hull vertices, position of one, position of the other)
+		vertices = self._counterclockwise()
+		count = len(vertices)
+		if count == 1:
+			return 0.0, 0, 0
+		best = (-1.0, 0, 0)
+		j = 1
+		for i in range(count):
+			j = self._antipodal(vertices, i, j)
+			for k in (i, (i+1) % count):
+				distance = float(np.hypot(*(vertices[k] - vertices[j])))
+				if distance > best[0]:
+					best = (distance, k, j)
+		return best[0], self._position(best[1]), self._position(best[2])
+
+	def width(self) -> tuple:
+		# (smallest distance between two parallel supporting lines, position of the edge's first
+		# vertex, position of the vertex opposite it); 0 when the hull has fewer than 3 vertices
+		vertices = self._counterclockwise()
+		count = len(vertices)
+		if count < 3:
+			return 0.0, 0, 0
+		best = (float('inf'), 0, 0)
+		j = 1
+		for i in range(count):
+			j = self._antipodal(vertices, i, j)
+			(ax, ay), (bx, by) = vertices[i], vertices[(i+1) % count]
+			height = cross(ax, ay, bx, by, vertices[j, 0], vertices[j, 1]) / float(np.hypot(bx - ax, by - ay))
+			if height < best[0]:
+				best = (height, i, j)
+		return best[0], self._position(best[1]), self._position(best[2])
+
+	def minimumAreaRectangle(self) -> tuple:
+		# (area, (4, 2) array of corners counterclockwise); degenerate hulls give a zero-area rectangle
+		vertices = self._counterclockwise()
+		count = len(vertices)
+		if count < 3:
+			corners = np.repeat(vertices[:1], 4, axis=0)
+			if count == 2:
+				corners[1:3] = vertices[1]
+			return 0.0, corners
+
+		edges = np.roll(vertices, -1, axis=0) - vertices
+		directions = edges / np.hypot(edges[:, 0], edges[:, 1])[:, None]
+		along = vertices @ directions[0]
+		maxAlong, minAlong = int(np.argmax(along)), int(np.argmin(along))
+		height = 1
+		best = None
+		for i in range(count):
+			ux, uy = directions[i]
+			normal = np.array([-uy, ux]) # points into the hull, which is on the left of a counterclockwise edge
+			height = self._antipodal(vertices, i, height)
+			for _ in range(count):
+				if np.dot(vertices[(maxAlong+1) % count], directions[i]) > np.dot(vertices[maxAlong], directions[i]):
+					maxAlong = (maxAlong + 1) % count
+				else:
+					break
+			for _ in range(count):
+				if np.dot(vertices[(minAlong+1) % count], directions[i]) < np.dot(vertices[minAlong], directions[i]):
+					minAlong = (minAlong + 1) % count
+				else:
+					break
+			low, high = np.dot(vertices[minAlong], directions[i]), np.dot(vertices[maxAlong], directions[i])
+			base, top = np.dot(vertices[i], normal), np.dot(vertices[height], normal)
+			area = (high - low) * (top - base)
+			if best is None or area < best[0]:
+				best = (area, low, high, base, top, directions[i].copy(), normal)
+
+		area, low, high, base, top, direction, normal = best
+		corners = np.array([low * direction + base * normal, high * direction + base * normal,
+			high * direction + top * normal, low * direction + top * normal])
+		return float(area), corners
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+# Headless convex hull runs; nothing here touches Qt. Points either come from
+# the same three distributions as the GUI, drawn with a seeded NumPy generator,
+# or from a file that is memory mapped rather than read: an .npy array of shape
+# (n, 2), or a headerless file of float64 x, y pairs with --raw. The report is
+# JSON with the hull indices, the hull vertices and how long each phase took.
+#
+#   python hull_batch.py --distribution oval --npoints 1000000 --seed 7
+#   python hull_batch.py --distribution gaussian --npoints 100000000 --save-points points.npy
+#   python hull_batch.py points.npy --solver parallel --workers 16 --output hull.json
+#   python hull_batch.py points.f64 --raw --solver divide --prefilter 4
+#   python hull_batch.py --discard-report --npoints 1000000
+#
+# --discard-report skips the hull and prints, for every distribution, the share
+# of points the Akl-Toussaint filter throws away with 4 and with 8 directions.
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+DISTRIBUTIONS = ('oval', 'sphere', 'gaussian')
+MAX_RADIUS = 0.98 # same cut-off as Proj2GUI.newPoints
+GAUSSIAN_SIGMA = 0.25
+GENERATION_BLOCK = 1 << 20 # candidates drawn per round, bounds the temporaries when n is huge
+SOLVERS = ('engine', 'divide', 'parallel')
+PREFILTER_DIRECTIONS = (0, 4, 8) # 0 turns the divide and conquer prefilter off
+
+
+def drawCandidates(distribution, rng, count):
+	# count candidate points, only the ones inside MAX_RADIUS are kept
+	if distribution == 'oval':
+		candidates = rng.uniform(-1.0, 1.0, (count, 2))
+		radius = np.einsum('ij,ij->i', candidates, candidates)
+	elif distribution == 'sphere':
+		candidates = rng.uniform(-1.0, 1.0, (count, 3))
+		radius = np.einsum('ij,ij->i', candidates, candidates)
+		candidates = candidates[:, :2]
+	else:
+		candidates = rng.normal(0.0, GAUSSIAN_SIGMA, (count, 2))
+		radius = np.einsum('ij,ij->i', candidates, candidates)
+	return candidates[radius <= MAX_RADIUS**2]
+
+def generatePoints(distribution, npoints, seed):
+	# (npoints, 2) float64 array, identical for identical (distribution, npoints, seed)
+	rng = np.random.default_rng(seed)
+	points = np.empty((npoints, 2), dtype=np.float64)
+	filled = 0
+	while filled < npoints:
+		accepted = drawCandidates(distribution, rng, GENERATION_BLOCK)[:npoints - filled]
+		points[filled:filled + len(accepted)] = accepted
+		filled += len(accepted)
+	return points
+
+def loadPoints(path, raw=False):
+	# Memory maps the file, nothing is read until the solver touches it
+	if raw:
+		points = np.memmap(path, dtype=np.float64, mode='r')
+		if len(points) % 2:
+			raise ValueError('{} does not hold whole x, y pairs'.format(path))
+		return points.reshape(-1, 2)
+	points = np.load(path, mmap_mode='r')
+	if points.ndim != 2 or points.shape[1] != 2:
+		raise ValueError('{} has shape {}, expected (n, 2)'.format(path, points.shape))
+	return points
+
+def solve(points, solver, workers, prefilter=8):
+	# Returns (hull indices into points, {phase: seconds}, points kept by the prefilter or None)
+	timings = {}
+	kept = None
+	if solver == 'engine':
+		from geometry.hull_engine import hull_indices
+		start = time.perf_counter()
+		indices = hull_indices(points)
+		timings['solve'] = time.perf_counter() - start
+	elif solver == 'parallel':
+		from geometry.parallel import parallel_hull_indices
+		start = time.perf_counter()
+		indices = parallel_hull_indices(points, workers) # sorts inside the solve
+		timings['solve'] = time.perf_counter() - start
+	else:
+		from geometry.divide_conquer import DivideAndConquerSolver
+		from geometry.interior_filter import akl_toussaint_filter
+		from geometry.presort import presort_order
+		xs, ys = np.ascontiguousarray(points[:, 0]), np.ascontiguousarray(points[:, 1])
+		candidates = np.arange(len(points))
+		if prefilter:
+			start = time.perf_counter()
+			candidates = akl_toussaint_filter(xs, ys, prefilter)
+			timings['prefilter'] = time.perf_counter() - start
+			kept = len(candidates)
+
+		start = time.perf_counter()
+		order = candidates[presort_order(xs[candidates], ys[candidates])]
+		timings['sort'] = time.perf_counter() - start
+
+		start = time.perf_counter()
+		hull = DivideAndConquerSolver().solveCoordinates(memoryview(xs), memoryview(ys), memoryview(order)) # memoryviews yield plain floats and ints
+		indices = hull.indices()
+		timings['solve'] = time.perf_counter() - start
+	return np.asarray(indices, dtype=np.intp), timings, kept
+
+def buildPolygon(points, indices):
+	# (h, 2, 2) array of hull edges, the headless counterpart of getPolygonFromIndices
+	vertices = np.asarray(points[indices], dtype=np.float64)
+	return np.stack([vertices, np.roll(vertices, -1, axis=0)], axis=1)
+
+def discardReport(npoints, seed):
+	# {distribution: {directions: share of the points the interior filter drops}}
+	from geometry.interior_filter import akl_toussaint_filter
+	report = {}
+	for distribution in DISTRIBUTIONS:
+		points = generatePoints(distribution, npoints, seed)
+		xs, ys = np.ascontiguousarray(points[:, 0]), np.ascontiguousarray(points[:, 1])
+		report[distribution] = {str(directions): 1.0 - len(akl_toussaint_filter(xs, ys, directions)) / npoints for directions in PREFILTER_DIRECTIONS[1:]}
+	return report
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Batch convex hull runner')
+	parser.add_argument('input', nargs='?', help='.npy file of shape (n, 2), or raw float64 pairs with --raw')
+	parser.add_argument('--raw', action='store_true', help='input is headerless float64 x, y pairs')
+	parser.add_argument('--distribution', choices=DISTRIBUTIONS, help='generate the points instead of reading them')
+	parser.add_argument('--npoints', type=int, default=1000000)
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--save-points', help='write the generated points here as .npy')
+	parser.add_argument('--solver', choices=SOLVERS, default='engine')
+	parser.add_argument('--workers', type=int, help='process pool size for --solver parallel, defaults to the CPU count')
+	parser.add_argument('--prefilter', type=int, choices=PREFILTER_DIRECTIONS, default=8, help='interior filter directions for --solver divide, 0 for none')
+	parser.add_argument('--discard-report', action='store_true', help='report the interior filter discard ratio per distribution instead of solving')
+	parser.add_argument('--output', help='write the JSON report here instead of stdout')
+	args = parser.parse_args(argv)
+	if args.discard_report:
+		report = {'npoints': args.npoints, 'seed': args.seed, 'discardRatio': discardReport(args.npoints, args.seed)}
+		writeReport(report, args.output)
+		return 0
+	if (args.input is None) == (args.distribution is None):
+		parser.error('give either an input file or --distribution')
+
+	timings = {}
+	start = time.perf_counter()
+	if args.distribution:
+		points = generatePoints(args.distribution, args.npoints, args.seed)
+		timings['generate'] = time.perf_counter() - start
+		if args.save_points:
+			np.save(args.save_points, points)
+	else:
+		points = loadPoints(args.input, args.raw)
+		timings['load'] = time.perf_counter() - start
+	if len(points) == 0:
+		parser.error('no points to run on')
+
+	indices, solveTimings, kept = solve(points, args.solver, args.workers, args.prefilter)
+	timings.update(solveTimings)
+
+	start = time.perf_counter()
+	polygon = buildPolygon(points, indices)
+	timings['polygon'] = time.perf_counter() - start
+
+	report = {
+		'source': args.input or args.distribution,
+		'seed': args.seed if args.distribution else None,
+		'npoints': len(points),
+		'solver': args.solver,
+		'timings': timings,
+		'hull': {'indices': indices.tolist(), 'vertices': polygon[:, 0].tolist()},
+	}
+	if kept is not None:
+		report['prefilter'] = {'directions': args.prefilter, 'kept': kept, 'discardRatio': 1.0 - kept / len(points)}
+	writeReport(report, args.output)
+	return 0
+
+def writeReport(report, path):
+	text = json.dumps(report, indent=1)
+	if path:
+		with open(path, 'w') as output:
+			output.write(text + '\n')
+	else:
+		print(text)
+
+
+if __name__ == '__main__':
+	sys.exit(main())